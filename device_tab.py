@@ -8,15 +8,20 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 import threading
 import queue
-import datetime
+import collections
 import csv
-from typing import Optional, List, Dict, Any
+import re
+from typing import Optional, List, Dict, Any, Tuple
 from protocol import (
     Packet, PacketBuilder, PacketParser,
-    FunctionCode, ErrorCode, RegisterMap
+    FunctionCode, ErrorCode, RegisterMap,
+    format_hex, format_words, format_timestamp
 )
 from ui_styles import FONTS, SPACING, COLORS, configure_text_widget
 
+# "start_addr,count,value" for Set Multiple (hex, decimal, hex)
+_MULTI_RE = re.compile(r"\s*([0-9A-Fa-f]+)\s*,\s*(\d+)\s*,\s*([0-9A-Fa-f]+)\s*")
+
 
 class DeviceTab:
     """Device (Slave) mode implementation for protocol testing.
@@ -38,6 +43,38 @@ class DeviceTab:
     SEARCH_ENTRY_W = 180 # Search entry width
     LABEL_COL_W = 80     # Label column width
     
+    # Register view layout: two header lines, then one line per register
+    REG_VIEW_FIRST_LINE = 3
+    REFRESH_DELAY_MS = 50  # Coalescing window for register view refreshes
+    BUFFER_COMPACT_SIZE = 4096  # Consumed bytes kept before compacting request_buffer
+    TX_BUFFER_SIZE = 512  # Larger than the biggest packet (261 bytes)
+    STATS_INTERVAL_MS = 200  # Statistics label refresh period
+    LOG_MAX_LINES = 5000  # Log widgets are trimmed to half this once exceeded
+    
+    # Parsed-request log lines, filled from the parse_request() fields
+    REQUEST_LOG_FORMATS = {
+        int(FunctionCode.READ_SINGLE): "  Read Single: Address=0x{register_address:04X}\n",
+        int(FunctionCode.WRITE_SINGLE): "  Write Single: Address=0x{register_address:04X}, Value=0x{register_value:04X}\n",
+        int(FunctionCode.READ_MULTIPLE): "  Read Multiple: Address=0x{register_address:04X}, Count={count}\n",
+        int(FunctionCode.WRITE_MULTIPLE): "  Write Multiple: Address=0x{register_address:04X}, Count={count}, Values=[{values_str}]\n",
+    }
+    
+    # Error simulation radio value -> error code returned
+    SIMULATED_ERRORS = {
+        "invalid_function": ErrorCode.INVALID_FUNCTION,
+        "invalid_address": ErrorCode.INVALID_ADDRESS,
+        "invalid_value": ErrorCode.INVALID_VALUE,
+        "internal_error": ErrorCode.INTERNAL_ERROR
+    }
+    
+    # Outgoing log names for normal responses
+    RESPONSE_NAMES = {
+        int(FunctionCode.READ_SINGLE_RESP): "Read Single Response",
+        int(FunctionCode.WRITE_SINGLE_RESP): "Write Single Response",
+        int(FunctionCode.READ_MULTIPLE_RESP): "Read Multiple Response",
+        int(FunctionCode.WRITE_MULTIPLE_RESP): "Write Multiple Response"
+    }
+    
     def __init__(self, parent_frame: ttk.Frame, serial_port_getter, data_queue: queue.Queue):
         """
         Initialize Device Tab.
@@ -55,20 +92,41 @@ class DeviceTab:
         self.device_address = 1  # This device's address (1-247)
         self.register_map = RegisterMap(size=256)  # Simulated register memory
         self.request_buffer = bytearray()  # Buffer for assembling incoming packets
+        self._rb_head = 0  # Read index of the first unconsumed byte in request_buffer
+        self._rx_chunks = collections.deque()  # Raw chunks queued by the serial read thread
+        # Reused for every decoded request; handlers must not keep a reference
+        self._rx_packet = Packet(device_address=0, message_id=0, function_code=0, data=b"")
+        self._tx_buf = bytearray(self.TX_BUFFER_SIZE)  # Reused for every response sent
+        
+        # Per-function request handlers
+        self._req_handlers = {
+            FunctionCode.READ_SINGLE: self._do_read_single,
+            FunctionCode.WRITE_SINGLE: self._do_write_single,
+            FunctionCode.READ_MULTIPLE: self._do_read_multiple,
+            FunctionCode.WRITE_MULTIPLE: self._do_write_multiple,
+        }
+        
+        # Deferred register view refresh (coalesces bursts of writes)
+        self._pending_refresh = None
+        self._dirty_ranges: List[Tuple[int, int]] = []
         
         # Error simulation
         self.simulate_errors = tk.BooleanVar(value=False)
         self.error_type = tk.StringVar(value="none")
         self.error_radio_buttons = []  # Store radio button references
+        self._radios_enabled: Optional[bool] = None  # Last applied radio state
         
         # Statistics
         self.request_count = 0
         self.response_count = 0
         self.error_count = 0
+        self._stats_dirty = False  # Counters changed since the labels were updated
         
         # Log controls
         self.incoming_auto_scroll = tk.BooleanVar(value=True)
         self.outgoing_auto_scroll = tk.BooleanVar(value=True)
+        self.logging_enabled = tk.BooleanVar(value=True)
+        self._log_line_counts: Dict[Any, int] = {}  # Lines currently held per log widget
         self.incoming_search_var = tk.StringVar()
         self.outgoing_search_var = tk.StringVar()
         self.incoming_search_pos = "1.0"
@@ -79,6 +137,7 @@ class DeviceTab:
         
         # Start processing loop
         self.process_requests()
+        self._flush_stats()
     
     def create_widgets(self):
         """Create Device tab UI elements with precise grid alignment"""
@@ -244,6 +303,8 @@ class DeviceTab:
         incoming_toolbar = ttk.Frame(self.incoming_frame)
         incoming_toolbar.pack(fill=tk.X, pady=(0, self.PAD))
         
+        ttk.Checkbutton(incoming_toolbar, text="Log", 
+                       variable=self.logging_enabled).pack(side=tk.LEFT, padx=(0, self.PAD))
         ttk.Checkbutton(incoming_toolbar, text="Auto-scroll", 
                        variable=self.incoming_auto_scroll).pack(side=tk.LEFT)
         
@@ -289,6 +350,8 @@ class DeviceTab:
         outgoing_toolbar = ttk.Frame(self.outgoing_frame)
         outgoing_toolbar.pack(fill=tk.X, pady=(0, self.PAD))
         
+        ttk.Checkbutton(outgoing_toolbar, text="Log", 
+                       variable=self.logging_enabled).pack(side=tk.LEFT, padx=(0, self.PAD))
         ttk.Checkbutton(outgoing_toolbar, text="Auto-scroll", 
                        variable=self.outgoing_auto_scroll).pack(side=tk.LEFT)
         
@@ -381,28 +444,55 @@ class DeviceTab:
     def clear_log(self, log_widget):
         """Clear a log widget and reset search position"""
         log_widget.delete(1.0, tk.END)
+        self._log_line_counts[log_widget] = 0
         if log_widget == self.incoming_request_log:
             self.incoming_search_pos = "1.0"
         else:
             self.outgoing_search_pos = "1.0"
     
+    def _append_log(self, log_widget, auto_scroll: tk.BooleanVar, *segments):
+        """Append to a log widget, trimming the oldest lines past LOG_MAX_LINES.
+        
+        Args:
+            log_widget: Text widget to append to
+            auto_scroll: Auto-scroll setting for that widget
+            *segments: Alternating text and tag arguments, as for Text.insert
+        """
+        log_widget.insert(tk.END, *segments)
+        
+        count = self._log_line_counts.get(log_widget, 0)
+        for text in segments[::2]:
+            count += text.count("\n")
+        if count > self.LOG_MAX_LINES:
+            # Drop the older half in one delete rather than trimming per insert
+            keep = self.LOG_MAX_LINES // 2
+            log_widget.delete("1.0", f"{count - keep + 1}.0")
+            count = keep
+        self._log_line_counts[log_widget] = count
+        
+        if auto_scroll.get():
+            log_widget.see(tk.END)
+    
     def toggle_error_radios(self):
         """Enable/disable radio buttons based on master checkbox"""
-        if self.simulate_errors.get():
-            # Enable all radio buttons
-            for btn in self.error_radio_buttons:
-                btn.config(state="normal")
-        else:
-            # Disable all radio buttons and force "No Error"
-            for btn in self.error_radio_buttons:
-                btn.config(state="disabled")
+        enabled = bool(self.simulate_errors.get())
+        if enabled == self._radios_enabled:
+            return  # Already in the requested state
+        self._radios_enabled = enabled
+        
+        # ttk state() flips the flag without a full config round-trip
+        state_spec = ["!disabled"] if enabled else ["disabled"]
+        for btn in self.error_radio_buttons:
+            btn.state(state_spec)
+        
+        if not enabled:
             self.error_type.set("none")  # Force to "No Error" when disabled
     
     def create_tooltip(self, widget, text):
         """Create tooltip for widget"""
         def on_enter(event):
             # Only show tooltip if widget is enabled
-            if str(widget.cget('state')) != 'disabled':
+            if not widget.instate(['disabled']):
                 tooltip = tk.Toplevel()
                 tooltip.wm_overrideredirect(True)
                 tooltip.wm_geometry(f"+{event.x_root+10}+{event.y_root+10}")
@@ -514,14 +604,14 @@ class DeviceTab:
     def set_multiple_registers(self):
         """Set multiple registers from comma-separated parameters"""
         try:
-            params = self.multi_params_var.get().split(',')
-            if len(params) < 3:
+            match = _MULTI_RE.fullmatch(self.multi_params_var.get())
+            if not match:
                 messagebox.showerror("Error", "Format: start_addr,count,value (e.g., 0010,4,1234)")
                 return
             
-            start_addr = int(params[0].strip(), 16)
-            count = int(params[1].strip())
-            value = int(params[2].strip(), 16)
+            start_addr = int(match[1], 16)
+            count = int(match[2])
+            value = int(match[3], 16)
             
             if start_addr + count > self.register_map.size:
                 messagebox.showerror("Error", f"Address range exceeds register map size")
@@ -535,8 +625,7 @@ class DeviceTab:
             
             self.refresh_register_view()
             # Highlight all changed registers
-            for i in range(count):
-                self.highlight_register(start_addr + i)
+            self.highlight_registers(start_addr, count)
             
             messagebox.showinfo("Success", f"Set {count} registers starting at {start_addr:04X} to value {value:04X}")
             
@@ -627,45 +716,62 @@ class DeviceTab:
             if self.register_map.write(addr, value):
                 self.refresh_register_view()
                 # Highlight the changed register
-                self.highlight_register(addr)
+                self.highlight_registers(addr, 1)
             else:
                 messagebox.showerror("Error", f"Invalid address or value")
         except ValueError as e:
             messagebox.showerror("Error", f"Invalid input: {str(e)}")
     
-    def highlight_register(self, address: int):
-        """Highlight a register in the display"""
-        # Find the line with this address
-        content = self.register_display.get(1.0, tk.END)
-        lines = content.split('\n')
-        for i, line in enumerate(lines):
-            if line.startswith(f"{address:04X}:"):
-                # Highlight this line
-                line_start = f"{i+1}.0"
-                line_end = f"{i+1}.end"
-                self.register_display.tag_add("highlight", line_start, line_end)
-                self.register_display.tag_config("highlight", background="yellow")
-                self.register_display.see(line_start)
-                # Remove highlight after 1 second
-                self.frame.after(1000, lambda: self.register_display.tag_remove("highlight", "1.0", tk.END))
-                break
+    def highlight_registers(self, address: int, count: int):
+        """Highlight a contiguous block of registers with a single tag range"""
+        count = min(count, self.register_map.size - address)
+        if address < 0 or count <= 0:
+            return
+        
+        first_line = address + self.REG_VIEW_FIRST_LINE
+        line_start = f"{first_line}.0"
+        line_end = f"{first_line + count - 1}.end"
+        self.register_display.tag_add("highlight", line_start, line_end)
+        self.register_display.tag_config("highlight", background="yellow")
+        self.register_display.see(line_start)
+        # Remove highlight after 1 second
+        self.frame.after(1000, lambda: self.register_display.tag_remove("highlight", "1.0", tk.END))
+    
+    def _mark_dirty(self, address: int, count: int):
+        """Queue a register range for the next coalesced view refresh"""
+        self._dirty_ranges.append((address, count))
+        if self._pending_refresh is None:
+            self._pending_refresh = self.frame.after(self.REFRESH_DELAY_MS, self._flush_refresh)
+    
+    def _flush_refresh(self):
+        """Redraw the register view once and highlight every written range"""
+        self._pending_refresh = None
+        ranges, self._dirty_ranges = self._dirty_ranges, []
+        
+        self.refresh_register_view()
+        
+        # Merge overlapping/adjacent ranges so each block gets one tag_add
+        merged: List[List[int]] = []
+        for start, count in sorted(ranges):
+            end = start + count
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        for start, end in merged:
+            self.highlight_registers(start, end - start)
     
     def refresh_register_view(self):
         """Refresh the register map display"""
+        # Build the whole dump first so the widget sees a single insert
+        lines = ["Addr: Value  (Decimal)", "-" * 30]
+        lines.extend([f"{addr:04X}: {value:04X}  ({value:5d})"
+                      for addr, value in enumerate(self.register_map.as_array())])
+        lines.append("")
+        
         self.register_display.config(state=tk.NORMAL)
         self.register_display.delete(1.0, tk.END)
-        
-        # Display registers in rows of 8
-        self.register_display.insert(tk.END, "Addr: Value  (Decimal)\n")
-        self.register_display.insert(tk.END, "-" * 30 + "\n")
-        
-        for i in range(0, self.register_map.size, 8):
-            for j in range(8):
-                if i + j < self.register_map.size:
-                    addr = i + j
-                    value = self.register_map.read(addr)
-                    self.register_display.insert(tk.END, f"{addr:04X}: {value:04X}  ({value:5d})\n")
-        
+        self.register_display.insert(tk.END, "\n".join(lines))
         self.register_display.config(state=tk.DISABLED)
     
     def reset_incoming_stats(self):
@@ -686,8 +792,20 @@ class DeviceTab:
         self.error_count = 0
         self.update_statistics()
     
+    def _flush_stats(self):
+        """Push changed counters to the labels, then reschedule.
+        
+        The packet path only sets _stats_dirty, so label updates happen at
+        most once per STATS_INTERVAL_MS however fast requests arrive.
+        """
+        if self._stats_dirty:
+            self.update_statistics()
+        self.frame.after(self.STATS_INTERVAL_MS, self._flush_stats)
+    
     def update_statistics(self):
         """Update statistics display"""
+        self._stats_dirty = False
+        
         # Update incoming stats
         self.incoming_total_label.config(text=str(self.request_count))
         
@@ -704,24 +822,14 @@ class DeviceTab:
         """Handle raw serial data from main thread.
         
         Called by the main serial reading thread when data is received.
-        Adds data to buffer and attempts to extract complete packets.
+        Tk widgets are not thread-safe, so the data is only queued here;
+        process_requests() logs it and extracts packets on the GUI thread.
         
         Args:
             data: Raw bytes received from serial port
         """
-        try:
-            # Debug: Show raw incoming data
-            if len(data) > 0:
-                timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
-                hex_str = " ".join(f"{b:02X}" for b in data)
-                self.incoming_request_log.insert(tk.END, f"[{timestamp}] Raw Data: {hex_str}\n", "data")
-                if self.incoming_auto_scroll.get():
-                    self.incoming_request_log.see(tk.END)
-            
-            self.request_buffer.extend(data)
-            self.process_buffer()
-        except Exception as e:
-            print(f"Error handling raw data: {e}")
+        if data:
+            self._rx_chunks.append(data)  # deque.append is atomic
     
     def process_buffer(self):
         """Process the request buffer for complete packets.
@@ -729,50 +837,92 @@ class DeviceTab:
         Scans the buffer for packet start flags (0x7E) and attempts to
         extract complete packets. Successfully parsed packets are passed
         to handle_request() for processing.
+        
+        Consumed bytes are skipped by advancing a read index instead of
+        re-slicing the buffer; the buffer is compacted in one step once
+        the consumed prefix grows past BUFFER_COMPACT_SIZE.
+        
+        No byte is scanned twice: bytes without a start flag are dropped,
+        and an incomplete packet leaves the read index on its start flag,
+        so the next call's find() returns immediately.
         """
+        buf = self.request_buffer
+        head = self._rb_head
+        size = len(buf)  # Only process_requests() appends, never while we scan
+        view = memoryview(buf)
         try:
             # Try to parse packets
-            while len(self.request_buffer) > 0:
+            while head < size:
                 # Look for start flag
-                start_idx = self.request_buffer.find(0x7E)
+                start_idx = buf.find(0x7E, head)
                 if start_idx == -1:
-                    self.request_buffer.clear()
+                    head = size
                     break
                 
-                # Remove data before start flag
-                if start_idx > 0:
-                    self.request_buffer = self.request_buffer[start_idx:]
+                # Skip data before start flag
+                head = start_idx
                 
                 # Check if we have enough data for header
-                if len(self.request_buffer) < 6:
+                if size - head < 6:
                     break
                 
                 # Get message length
-                msg_length = self.request_buffer[3]
+                msg_length = buf[head + 3]
                 total_length = 6 + msg_length  # Header + data + checksum
                 
                 # Check if we have complete packet
-                if len(self.request_buffer) < total_length:
+                if size - head < total_length:
                     break
                 
-                # Extract packet
-                packet_data = bytes(self.request_buffer[:total_length])
-                self.request_buffer = self.request_buffer[total_length:]
-                
-                # Parse packet
-                packet = Packet.from_bytes(packet_data)
+                # Parse the packet in place into the reused instance (valid
+                # until the next packet), then advance the read index past it
+                packet = Packet.from_bytes_into(buf, self._rx_packet, head)
                 if packet:
-                    self.handle_request(packet)
+                    # Hand over the wire bytes for logging; released right after
+                    with view[head:head + total_length] as raw:
+                        self.handle_request(packet, raw)
+                head += total_length
                 
         except Exception as e:
             print(f"Error processing buffer: {e}")
+        finally:
+            view.release()  # The buffer can't be resized while exported
+            if head >= size:
+                buf.clear()
+                head = 0
+            elif head > self.BUFFER_COMPACT_SIZE:
+                del buf[:head]
+                head = 0
+            self._rb_head = head
     
     def process_requests(self):
-        """Legacy method - now just schedules next check"""
+        """Drain data queued by handle_raw_data, then schedule the next check.
+        
+        Everything received since the last check is logged with a single
+        insert before the buffer is scanned for packets.
+        """
+        chunks = self._rx_chunks
+        if chunks:
+            try:
+                log_enabled = self.logging_enabled.get()
+                segments = []
+                while chunks:
+                    data = chunks.popleft()
+                    if log_enabled:
+                        # Debug: Show raw incoming data
+                        segments += [f"[{format_timestamp()}] Raw Data: {format_hex(data)}\n", "data"]
+                    self.request_buffer.extend(data)
+                
+                if segments:
+                    self._append_log(self.incoming_request_log, self.incoming_auto_scroll, *segments)
+                self.process_buffer()
+            except Exception as e:
+                print(f"Error handling raw data: {e}")
+        
         # Schedule next check - reduced interval for better responsiveness
         self.frame.after(5, self.process_requests)
     
-    def handle_request(self, packet: Packet):
+    def handle_request(self, packet: Packet, raw: Optional[memoryview] = None):
         """Handle received request packet.
         
         Processes the request based on device address matching:
@@ -782,73 +932,80 @@ class DeviceTab:
         
         Args:
             packet: Parsed request packet from host
+            raw: The packet's bytes as received, only valid during this call
         """
         self.request_count += 1
-        self.update_statistics()
+        self._stats_dirty = True
+        
+        address = packet.device_address
+        for_us = address == self.device_address or address == 0
+        log_enabled = self.logging_enabled.get()
+        if not for_us and not log_enabled:
+            return  # Another device's traffic and nobody is watching the log
+        
+        parsed = PacketParser.parse_request(packet)
         
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
+        # Only process for our address or broadcast; broadcasts get no response
+        if parsed and for_us:
+            response = self.process_request(packet, parsed)
+            if response and address != 0:
+                self.send_response(response)
+        
+        if log_enabled:
+            self.log_request(packet, parsed, raw)
+    
+    def log_request(self, packet: Packet, parsed: Optional[Dict[str, Any]],
+                    raw: Optional[memoryview] = None):
+        """Write a received request to the incoming log.
+        
+        Kept separate from handle_request so all formatting can be skipped
+        when logging is disabled.
+        
+        Args:
+            packet: Request packet from host
+            parsed: Result of PacketParser.parse_request, None if invalid
+            raw: Received bytes; the packet is re-serialized only if omitted
+        """
+        timestamp = format_timestamp()
         
         # Log the request - ALWAYS show incoming messages
-        self.incoming_request_log.insert(tk.END, f"[{timestamp}] Request (ID: {packet.message_id:02X}):\n", "header")
+        segments = [f"[{timestamp}] Request (ID: {packet.message_id:02X}):\n", "header"]
         
         # Display raw packet
-        packet_bytes = packet.to_bytes()
-        hex_str = " ".join(f"{b:02X}" for b in packet_bytes)
-        self.incoming_request_log.insert(tk.END, f"  Raw: {hex_str}\n", "data")
+        hex_str = format_hex(raw if raw is not None else packet.to_bytes())
+        segments += [f"  Raw: {hex_str}\n", "data"]
         
         # Show device address info - but don't return early
         if packet.device_address != self.device_address and packet.device_address != 0:
-            self.incoming_request_log.insert(tk.END, f"  Device Address: {packet.device_address} (not for this device: {self.device_address})\n", "data")
+            segments += [f"  Device Address: {packet.device_address} (not for this device: {self.device_address})\n", "data"]
         elif packet.device_address == 0:
-            self.incoming_request_log.insert(tk.END, f"  Device Address: {packet.device_address} (broadcast)\n", "data")
+            segments += [f"  Device Address: {packet.device_address} (broadcast)\n", "data"]
         else:
-            self.incoming_request_log.insert(tk.END, f"  Device Address: {packet.device_address} (matches this device)\n", "data")
+            segments += [f"  Device Address: {packet.device_address} (matches this device)\n", "data"]
         
-        # Parse request - always show what we received
-        parsed = PacketParser.parse_request(packet)
         if not parsed:
-            self.incoming_request_log.insert(tk.END, f"  Invalid request format\n\n", "error")
-            if self.incoming_auto_scroll.get():
-                self.incoming_request_log.see(tk.END)
+            segments += ["  Invalid request format\n\n", "error"]
+            self._append_log(self.incoming_request_log, self.incoming_auto_scroll, *segments)
             return
         
         # Display parsed request - ALWAYS show the content
-        func = packet.function_code
-        if func == FunctionCode.READ_SINGLE:
-            self.incoming_request_log.insert(tk.END, 
-                f"  Read Single: Address=0x{parsed['register_address']:04X}\n", "data")
-        elif func == FunctionCode.WRITE_SINGLE:
-            self.incoming_request_log.insert(tk.END, 
-                f"  Write Single: Address=0x{parsed['register_address']:04X}, Value=0x{parsed['register_value']:04X}\n", "data")
-        elif func == FunctionCode.READ_MULTIPLE:
-            self.incoming_request_log.insert(tk.END, 
-                f"  Read Multiple: Address=0x{parsed['register_address']:04X}, Count={parsed['count']}\n", "data")
-        elif func == FunctionCode.WRITE_MULTIPLE:
-            values_str = ", ".join(f"0x{v:04X}" for v in parsed.get('values', []))
-            self.incoming_request_log.insert(tk.END, 
-                f"  Write Multiple: Address=0x{parsed['register_address']:04X}, Count={parsed['count']}, Values=[{values_str}]\n", "data")
-        
-        # Now check if we should process and respond (only process for our address or broadcast)
+        template = self.REQUEST_LOG_FORMATS.get(packet.function_code)
+        if template:
+            values_str = format_words(parsed['values']) if 'values' in parsed else ""
+            segments += [template.format(values_str=values_str, **parsed), "data"]
+        
         should_process = (packet.device_address == self.device_address or packet.device_address == 0)
         
         if should_process:
-            self.incoming_request_log.insert(tk.END, f"  → Processing request\n", "data")
+            segments += ["  → Processing request\n", "data"]
             
-            # Process request and send response (if not broadcast)
-            if packet.device_address != 0:
-                response = self.process_request(packet, parsed)
-                if response:
-                    self.send_response(response)
-            else:
-                # For broadcast, just process without responding
-                self.process_request(packet, parsed)
-                self.incoming_request_log.insert(tk.END, "  → Broadcast - no response sent\n", "data")
+            if packet.device_address == 0:
+                segments += ["  → Broadcast - no response sent\n", "data"]
         else:
-            self.incoming_request_log.insert(tk.END, f"  → Not processing (wrong device address)\n", "data")
+            segments += ["  → Not processing (wrong device address)\n", "data"]
         
-        self.incoming_request_log.insert(tk.END, "\n")
-        if self.incoming_auto_scroll.get():
-            self.incoming_request_log.see(tk.END)
+        segments += ["\n", ""]
+        self._append_log(self.incoming_request_log, self.incoming_auto_scroll, *segments)
     
     def process_request(self, packet: Packet, parsed: Dict[str, Any]) -> Optional[Packet]:
         """Process request and generate response.
@@ -865,93 +1022,61 @@ class DeviceTab:
         """
         # Check for error simulation - only if enabled AND not "none"
         if self.simulate_errors.get() and self.error_type.get() != "none":
-            error_type = self.error_type.get()
-            self.error_count += 1
-            self.update_statistics()
-            
-            error_map = {
-                "invalid_function": ErrorCode.INVALID_FUNCTION,
-                "invalid_address": ErrorCode.INVALID_ADDRESS,
-                "invalid_value": ErrorCode.INVALID_VALUE,
-                "internal_error": ErrorCode.INTERNAL_ERROR
-            }
-            error_code = error_map.get(error_type, ErrorCode.INTERNAL_ERROR)
-            return PacketBuilder.error_response(
-                self.device_address, packet.message_id, packet.function_code, error_code
-            )
+            error_code = self.SIMULATED_ERRORS.get(self.error_type.get(), ErrorCode.INTERNAL_ERROR)
+            return self._error_response(packet, error_code)
         
         # Process based on function code
-        func = packet.function_code
-        
-        if func == FunctionCode.READ_SINGLE:
-            addr = parsed['register_address']
-            value = self.register_map.read(addr)
-            if value is not None:
-                return PacketBuilder.read_single_response(
-                    self.device_address, packet.message_id, addr, value
-                )
-            else:
-                self.error_count += 1
-                self.update_statistics()
-                return PacketBuilder.error_response(
-                    self.device_address, packet.message_id, func, ErrorCode.INVALID_ADDRESS
-                )
-        
-        elif func == FunctionCode.WRITE_SINGLE:
-            addr = parsed['register_address']
-            value = parsed['register_value']
-            if self.register_map.write(addr, value):
-                self.refresh_register_view()
-                self.highlight_register(addr)
-                return PacketBuilder.write_single_response(
-                    self.device_address, packet.message_id, addr, value
-                )
-            else:
-                self.error_count += 1
-                self.update_statistics()
-                return PacketBuilder.error_response(
-                    self.device_address, packet.message_id, func, ErrorCode.INVALID_ADDRESS
-                )
-        
-        elif func == FunctionCode.READ_MULTIPLE:
-            addr = parsed['register_address']
-            count = parsed['count']
-            values = self.register_map.read_multiple(addr, count)
-            if values is not None:
-                return PacketBuilder.read_multiple_response(
-                    self.device_address, packet.message_id, addr, values
-                )
-            else:
-                self.error_count += 1
-                self.update_statistics()
-                return PacketBuilder.error_response(
-                    self.device_address, packet.message_id, func, ErrorCode.INVALID_ADDRESS
-                )
-        
-        elif func == FunctionCode.WRITE_MULTIPLE:
-            addr = parsed['register_address']
-            values = parsed.get('values', [])
-            if self.register_map.write_multiple(addr, values):
-                self.refresh_register_view()
-                for i in range(len(values)):
-                    self.highlight_register(addr + i)
-                return PacketBuilder.write_multiple_response(
-                    self.device_address, packet.message_id, addr, len(values)
-                )
-            else:
-                self.error_count += 1
-                self.update_statistics()
-                return PacketBuilder.error_response(
-                    self.device_address, packet.message_id, func, ErrorCode.INVALID_ADDRESS
-                )
-        
-        else:
+        handler = self._req_handlers.get(packet.function_code)
+        if handler is None:
             # Unsupported function
-            self.error_count += 1
-            self.update_statistics()
-            return PacketBuilder.error_response(
-                self.device_address, packet.message_id, func, ErrorCode.INVALID_FUNCTION
-            )
+            return self._error_response(packet, ErrorCode.INVALID_FUNCTION)
+        return handler(packet, parsed)
+    
+    def _error_response(self, packet: Packet, error_code: ErrorCode) -> Packet:
+        """Count an error and build the matching error response"""
+        self.error_count += 1
+        self._stats_dirty = True
+        return PacketBuilder.error_response(
+            self.device_address, packet.message_id, packet.function_code, error_code
+        )
+    
+    def _do_read_single(self, packet: Packet, parsed: Dict[str, Any]) -> Packet:
+        addr = parsed['register_address']
+        value = self.register_map.read(addr)
+        if value is None:
+            return self._error_response(packet, ErrorCode.INVALID_ADDRESS)
+        return PacketBuilder.read_single_response(
+            self.device_address, packet.message_id, addr, value
+        )
+    
+    def _do_write_single(self, packet: Packet, parsed: Dict[str, Any]) -> Packet:
+        addr = parsed['register_address']
+        value = parsed['register_value']
+        if not self.register_map.write(addr, value):
+            return self._error_response(packet, ErrorCode.INVALID_ADDRESS)
+        self._mark_dirty(addr, 1)
+        return PacketBuilder.write_single_response(
+            self.device_address, packet.message_id, addr, value
+        )
+    
+    def _do_read_multiple(self, packet: Packet, parsed: Dict[str, Any]) -> Packet:
+        addr = parsed['register_address']
+        values = self.register_map.read_multiple(addr, parsed['count'])
+        if values is None:
+            return self._error_response(packet, ErrorCode.INVALID_ADDRESS)
+        return PacketBuilder.read_multiple_response(
+            self.device_address, packet.message_id, addr, values
+        )
+    
+    def _do_write_multiple(self, packet: Packet, parsed: Dict[str, Any]) -> Packet:
+        addr = parsed['register_address']
+        values = parsed.get('values', [])
+        if not self.register_map.write_multiple(addr, values):
+            return self._error_response(packet, ErrorCode.INVALID_ADDRESS)
+        self._mark_dirty(addr, len(values))
+        return PacketBuilder.write_multiple_response(
+            self.device_address, packet.message_id, addr, len(values)
+        )
     
     def send_response(self, response: Packet):
         """Send response packet back to host.
@@ -967,42 +1092,38 @@ class DeviceTab:
             return
         
         try:
-            response_bytes = response.to_bytes()
+            n = response.serialize_into(self._tx_buf)
+            response_bytes = memoryview(self._tx_buf)[:n]
             serial_port.write(response_bytes)
             
             self.response_count += 1
-            self.update_statistics()
+            self._stats_dirty = True
+            
+            if not self.logging_enabled.get():
+                return
             
             # Log the response
-            timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
-            self.outgoing_response_log.insert(tk.END, f"[{timestamp}] Response (ID: {response.message_id:02X}):\n", "header")
+            timestamp = format_timestamp()
+            segments = [f"[{timestamp}] Response (ID: {response.message_id:02X}):\n", "header"]
             
             # Display raw packet
-            hex_str = " ".join(f"{b:02X}" for b in response_bytes)
-            self.outgoing_response_log.insert(tk.END, f"  Raw: {hex_str}\n", "data")
+            hex_str = format_hex(response_bytes)
+            segments += [f"  Raw: {hex_str}\n", "data"]
             
             # Display parsed response
             if response.function_code & 0x80:
                 # Error response
                 error_code = response.data[0] if response.data else 0
                 desc = PacketParser.get_error_description(error_code)
-                self.outgoing_response_log.insert(tk.END, f"  Error Response: {desc}\n", "error")
+                segments += [f"  Error Response: {desc}\n", "error"]
             else:
                 # Normal response
-                func_names = {
-                    FunctionCode.READ_SINGLE_RESP: "Read Single Response",
-                    FunctionCode.WRITE_SINGLE_RESP: "Write Single Response",
-                    FunctionCode.READ_MULTIPLE_RESP: "Read Multiple Response",
-                    FunctionCode.WRITE_MULTIPLE_RESP: "Write Multiple Response"
-                }
-                func_name = func_names.get(response.function_code, "Unknown")
-                self.outgoing_response_log.insert(tk.END, f"  {func_name}\n", "data")
+                func_name = self.RESPONSE_NAMES.get(response.function_code, "Unknown")
+                segments += [f"  {func_name}\n", "data"]
             
-            self.outgoing_response_log.insert(tk.END, "\n")
-            if self.outgoing_auto_scroll.get():
-                self.outgoing_response_log.see(tk.END)
+            segments += ["\n", ""]
+            self._append_log(self.outgoing_response_log, self.outgoing_auto_scroll, *segments)
             
         except Exception as e:
-            self.outgoing_response_log.insert(tk.END, f"  Send error: {str(e)}\n\n", "error")
-            if self.outgoing_auto_scroll.get():
-                self.outgoing_response_log.see(tk.END)
\ No newline at end of file
+            self._append_log(self.outgoing_response_log, self.outgoing_auto_scroll,
+                             f"  Send error: {str(e)}\n\n", "error")
\ No newline at end of file
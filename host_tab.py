@@ -7,11 +7,13 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import threading
 import queue
-import datetime
-from typing import Optional, List, Dict, Any
+import collections
+from array import array
+import time
+from typing import Optional, List, Tuple
 from protocol import (
     Packet, PacketBuilder, PacketParser, 
-    FunctionCode, ErrorCode, RegisterMap
+    FunctionCode, ErrorCode, RegisterMap, format_hex, format_words, format_timestamp
 )
 from ui_styles import (
     FONTS, SPACING, COLORS, init_style, create_status_pill, 
@@ -30,6 +32,50 @@ class HostTab:
     
     # Using shared color scheme from ui_styles
     
+    POLL_MIN_MS = 2   # Response poll interval while data or replies are expected
+    POLL_MAX_MS = 50  # Idle poll interval ceiling
+    BUFFER_COMPACT_SIZE = 4096  # Consumed bytes kept before compacting response_buffer
+    TX_BUFFER_SIZE = 512  # Larger than the biggest packet (261 bytes)
+    LOG_MAX_LINES = 5000  # Log is trimmed to half this once exceeded
+    TIMEOUT_APPLY_MS = 200  # Quiet period before a Timeout spinbox edit takes effect
+    WHEEL_TICK_MS = 20  # Resolution of the response timeout wheel
+    WHEEL_SLOTS = 256  # One turn spans 5120 ms; longer timeouts go round again
+    
+    # Request function names shown in the packet preview
+    FUNC_NAMES = {
+        0x01: "Read Single",
+        0x02: "Write Single",
+        0x03: "Read Multiple",
+        0x04: "Write Multiple"
+    }
+    # Parsed-response log lines, filled from the parse_response() fields
+    RESPONSE_LOG_FORMATS = {
+        int(FunctionCode.READ_SINGLE_RESP): (
+            "  Read Single Response:\n"
+            "    Address: 0x{register_address:04X}\n"
+            "    Value: 0x{register_value:04X} ({register_value})\n"),
+        int(FunctionCode.WRITE_SINGLE_RESP): (
+            "  Write Single Response:\n"
+            "    Address: 0x{register_address:04X}\n"
+            "    Value: 0x{register_value:04X}\n"),
+        int(FunctionCode.READ_MULTIPLE_RESP): (
+            "  Read Multiple Response:\n"
+            "    Starting Address: 0x{register_address:04X}\n"
+            "    Count: {count}\n"
+            "    Values: [{values_str}]\n"),
+        int(FunctionCode.WRITE_MULTIPLE_RESP): (
+            "  Write Multiple Response:\n"
+            "    Starting Address: 0x{register_address:04X}\n"
+            "    Count Written: {count}\n"),
+    }
+    BYTE_LABELS = tuple(f"0x{i:02X}" for i in range(256))  # "0x7E" etc. for header fields
+    HEX_FIELD_CHARS = frozenset("0123456789abcdefABCDEFxX ")  # Accepted in the hex entries
+    VALUES_FIELD_CHARS = HEX_FIELD_CHARS | {","}  # Values also takes the separators
+    # Byte values valid after a start flag: every known code plus any
+    # error response (bit 0x80 set), so unknown error codes still parse
+    FUNCTION_CODES = frozenset(map(int, FunctionCode)) | frozenset(range(0x80, 0x100))
+    HEX_DIGITS = {c: i for i, c in enumerate("0123456789ABCDEF")}  # Message ID digit values
+    
     def __init__(self, parent_frame: ttk.Frame, serial_port_getter, data_queue: queue.Queue):
         """
         Initialize Host Tab.
@@ -45,11 +91,55 @@ class HostTab:
         
         # Protocol state management
         self.message_id = 0  # Current message ID (auto-increments)
-        self.pending_requests: Dict[int, Dict[str, Any]] = {}  # Track requests awaiting responses
+        # Requests awaiting responses as parallel arrays indexed by the 8-bit
+        # message ID, plus a bitmask of the occupied slots
+        self._pending_ts = array('d', [0.0]) * 256  # time.monotonic() when sent
+        self._pending_op: List[str] = [""] * 256  # Operation title for the log
+        self._pending_packet: List[Optional[Packet]] = [None] * 256  # Request sent
+        self._pending_mask = 0
+        self._pending_slot = array('H', [0]) * 256  # Timing wheel slot holding the ID
+        self._pending_rounds = array('H', [0]) * 256  # Wheel turns left before it expires
+        # Response timeouts: a hashed timing wheel of message ID sets, turned
+        # by process_responses, instead of one Tk timer per request
+        self._wheel = [set() for _ in range(self.WHEEL_SLOTS)]
+        self._wheel_cursor = 0
+        self._wheel_time = time.monotonic()  # When the cursor reached its current slot
         self.response_timeout = 500  # Response timeout in milliseconds
+        self._timeout_after_id = None  # Pending _apply_timeout callback
+        
+        # Inputs the packet preview was last built from, and the
+        # (packet, bytes, hex) it showed, reused by send_request
+        self._preview_key = None
+        self._preview_packet = None
+        self._preview_pending = None  # after_idle id of a queued update_preview
+        self._tx_buf = bytearray(self.TX_BUFFER_SIZE)  # Serialized request, shared by preview and send
+        self._values_cache = ("", [])  # Last Values text and the list parsed from it
         
         # Response handling
         self.response_buffer = bytearray()
+        self._rb_head = 0  # Read index of the first unconsumed byte in response_buffer
+        # Reused for every decoded response; handle_response must not keep a reference
+        self._rx_packet = Packet(device_address=0, message_id=0, function_code=0, data=b"")
+        self._rx_queue: "queue.Queue[bytes]" = queue.Queue()  # Raw chunks from the serial read thread
+        self._ui_queue = collections.deque()  # Log entries waiting for process_responses to insert
+        self._pending_lock = threading.Lock()  # Guards the _pending_* slots (GUI thread + parse worker)
+        self._poll_interval = self.POLL_MIN_MS
+        self._poll_after_id = None
+        self._log_lines = 0  # Lines currently held by log_display
+        self._see_pending = False  # A scroll to the end is queued for the next idle
+        self._log_unexpected = True  # Log responses that match no pending request
+        
+        # Packet builder for each operation radio value
+        self._op_builders = {
+            "read_single": self._build_read_single,
+            "write_single": self._build_write_single,
+            "read_multiple": self._build_read_multiple,
+            "write_multiple": self._build_write_multiple,
+        }
+        
+        # Parse and format responses off the GUI thread
+        self._parse_thread = threading.Thread(target=self._parse_worker, daemon=True)
+        self._parse_thread.start()
         
         # Build UI
         self.create_widgets()
@@ -89,12 +179,13 @@ class HostTab:
         self.device_addr_spin = ttk.Spinbox(addr_content, from_=0, to=247, 
                                            textvariable=self.device_addr_var, width=12)
         self.device_addr_spin.grid(row=0, column=1, padx=(0, 10), sticky='w')
-        self.device_addr_var.trace('w', lambda *args: self.update_preview())
+        self.device_addr_var.trace('w', self._schedule_preview)
         ttk.Label(addr_content, text="(0 = Broadcast)", font=FONTS["ui_small"], foreground="#6B7280").grid(row=0, column=2, padx=(2, 20), sticky='w')
         
         # Message ID field - aligned to same grid
         ttk.Label(addr_content, text="Message ID:").grid(row=0, column=3, **GRID_OPTS['label'])
         self.msg_id_var = tk.StringVar(value=f"{self.message_id:02X}")
+        self._msg_id_str = self.msg_id_var.get()  # Last accepted Message ID text
         self.msg_id_entry = ttk.Entry(addr_content, textvariable=self.msg_id_var, width=12, font=FONTS["mono"])
         self.msg_id_entry.grid(row=0, column=4, padx=(0, 10), sticky='w')
         self.msg_id_var.trace('w', self.on_message_id_change)
@@ -160,13 +251,18 @@ class HostTab:
         # Configure column widths for consistent alignment
         params_content.columnconfigure(1, weight=1)
         
+        # The hex entries validate keystrokes in Tk and queue the preview
+        # from there, instead of a variable trace per field
+        self._edit_vcmd = (self.frame.register(self._on_edit), '%P', '%W')
+        self._edit_chars = {}  # Entry widget path -> accepted characters
+        
         # Register Address - row 0
         tk.Label(params_content, text="Register Address (hex):",
                 width=25, anchor='e').grid(row=0, column=0, padx=(0, 10), pady=3, sticky='e')
         self.reg_addr_var = tk.StringVar(value="0000")
         self.reg_addr_entry = ttk.Entry(params_content, textvariable=self.reg_addr_var, width=15)
         self.reg_addr_entry.grid(row=0, column=1, pady=3, sticky='w')
-        self.reg_addr_var.trace('w', lambda *args: self.update_preview())
+        self._validate_edits(self.reg_addr_entry, self.HEX_FIELD_CHARS)
         
         # Register Value (for write operations) - row 1
         self.value_label = tk.Label(params_content, text="Register Value (hex):",
@@ -175,7 +271,7 @@ class HostTab:
         self.reg_value_var = tk.StringVar(value="0000")
         self.reg_value_entry = ttk.Entry(params_content, textvariable=self.reg_value_var, width=15)
         self.reg_value_entry.grid(row=1, column=1, pady=3, sticky='w')
-        self.reg_value_var.trace('w', lambda *args: self.update_preview())
+        self._validate_edits(self.reg_value_entry, self.HEX_FIELD_CHARS)
         
         # Count (for multiple operations) - row 2
         self.count_label = tk.Label(params_content, text="Count (1-255):",
@@ -184,7 +280,7 @@ class HostTab:
         self.count_var = tk.IntVar(value=1)
         self.count_spin = ttk.Spinbox(params_content, from_=1, to=255, textvariable=self.count_var, width=15)
         self.count_spin.grid(row=2, column=1, pady=3, sticky='w')
-        self.count_var.trace('w', lambda *args: self.update_preview())
+        self.count_var.trace('w', self._schedule_preview)
         
         # Multiple values (for write multiple) - row 3
         self.values_label = tk.Label(params_content, text="Values (comma-separated):",
@@ -193,7 +289,7 @@ class HostTab:
         self.values_var = tk.StringVar(value="0000,0001,0002")
         self.values_entry = ttk.Entry(params_content, textvariable=self.values_var, width=50)
         self.values_entry.grid(row=3, column=1, pady=3, sticky='w')
-        self.values_var.trace('w', lambda *args: self.update_preview())
+        self._validate_edits(self.values_entry, self.VALUES_FIELD_CHARS)
         
         # Control Buttons with timeout indicator - using grid for better alignment
         control_frame = tk.Frame(left_column)
@@ -221,13 +317,20 @@ class HostTab:
         timeout_spin = ttk.Spinbox(control_content, from_=100, to=5000, textvariable=self.timeout_var, 
                                    width=8, increment=100)
         timeout_spin.grid(row=0, column=3, padx=(0, 10), sticky='w')
-        self.timeout_var.trace('w', lambda *args: setattr(self, 'response_timeout', self.timeout_var.get()))
+        self.timeout_var.trace_add("write", self._on_timeout_change)
         
         # Timeout indicator (shows countdown when waiting for response)
         self.timeout_indicator = tk.Label(control_content, text="",
                                          fg='orange', font=('Arial', 10, 'bold'), width=15)
         self.timeout_indicator.grid(row=0, column=4, padx=10, sticky='w')
         
+        # Whether responses to IDs we never sent (other masters on the bus) are logged.
+        # Mirrored into a plain bool since the parse worker thread reads it.
+        self.log_unexpected_var = tk.BooleanVar(value=self._log_unexpected)
+        ttk.Checkbutton(control_content, text="Log Unexpected",
+                        variable=self.log_unexpected_var).grid(row=0, column=5, sticky='w')
+        self.log_unexpected_var.trace('w', lambda *args: setattr(self, '_log_unexpected', self.log_unexpected_var.get()))
+        
         # Packet Preview with amber background and parsed fields
         preview_frame = tk.LabelFrame(left_column, text="Packet Preview & Inspection", 
                                      fg='#e65100',
@@ -304,6 +407,33 @@ class HostTab:
         self.log_display.tag_config("timeout", foreground="orange")
         self.log_display.tag_config("system", foreground="gray")
         
+        # Grid placement of each optional parameter widget, and which of
+        # them each operation shows
+        self._field_grid = {
+            self.value_label: dict(row=1, column=0, padx=(0, 10), pady=3, sticky='e'),
+            self.reg_value_entry: dict(row=1, column=1, pady=3, sticky='w'),
+            self.count_label: dict(row=2, column=0, padx=(0, 10), pady=3, sticky='e'),
+            self.count_spin: dict(row=2, column=1, pady=3, sticky='w'),
+            self.values_label: dict(row=3, column=0, padx=(0, 10), pady=3, sticky='e'),
+            self.values_entry: dict(row=3, column=1, pady=3, sticky='w'),
+        }
+        self._op_fields = {
+            "read_single": (),
+            "write_single": (self.value_label, self.reg_value_entry),
+            "read_multiple": (self.count_label, self.count_spin),
+            "write_multiple": (self.count_label, self.count_spin,
+                               self.values_label, self.values_entry),
+        }
+        self._visible_fields = set(self._field_grid)  # All are gridded when created
+        
+        # Inputs beyond address, register and ID that each operation's packet uses
+        self._op_inputs = {
+            "read_single": (),
+            "write_single": (self.reg_value_var,),
+            "read_multiple": (self.count_var,),
+            "write_multiple": (self.count_var, self.values_var),
+        }
+        
         # Initially hide unused fields and update preview
         self.on_operation_change()
     
@@ -317,80 +447,143 @@ class HostTab:
             if not value:
                 return
             
-            # Validate hex format and range
-            if len(value) <= 2 and all(c in '0123456789ABCDEF' for c in value):
-                msg_id = int(value, 16)
-                if 0 <= msg_id <= 255:
-                    self.message_id = msg_id
-                    self.update_preview()
-                    return
+            # Nothing new, e.g. the trace fired for our own revert below
+            if value == self._msg_id_str:
+                return
             
-            # If invalid, revert to last valid value
-            self.msg_id_var.set(f"{self.message_id:02X}")
-        except ValueError:
+            # At most two hex digits, looked up directly (always 0-255)
+            digits = self.HEX_DIGITS
+            if len(value) == 1:
+                msg_id = digits[value]
+            elif len(value) == 2:
+                msg_id = (digits[value[0]] << 4) | digits[value[1]]
+            else:
+                raise ValueError(value)
+            self._msg_id_str = value
+            
+            # "5" -> "05" and the like don't change the packet
+            if msg_id != self.message_id:
+                self.message_id = msg_id
+                self._schedule_preview()
+        except (KeyError, ValueError):
             # Revert to last valid value on error
-            self.msg_id_var.set(f"{self.message_id:02X}")
+            self._msg_id_str = f"{self.message_id:02X}"
+            self.msg_id_var.set(self._msg_id_str)
+    
+    def _validate_edits(self, entry: ttk.Entry, allowed: frozenset):
+        """Route an entry's edits through _on_edit, accepting only `allowed` characters"""
+        self._edit_chars[str(entry)] = allowed
+        entry.configure(validate='key', validatecommand=self._edit_vcmd)
+    
+    def _on_edit(self, proposed: str, widget: str) -> bool:
+        """Tk validatecommand: reject stray characters, else queue a preview.
+        
+        Args:
+            proposed: Entry text if the edit is allowed (%P)
+            widget: Path name of the entry being edited (%W)
+        """
+        if not self._edit_chars[widget].issuperset(proposed):
+            return False
+        self._schedule_preview()  # Runs at idle, once the variable holds the new text
+        return True
+    
+    def _on_timeout_change(self, *args):
+        """Apply a Timeout edit once typing pauses, not on every keystroke"""
+        if self._timeout_after_id is not None:
+            self.frame.after_cancel(self._timeout_after_id)
+        self._timeout_after_id = self.frame.after(self.TIMEOUT_APPLY_MS, self._apply_timeout)
+    
+    def _apply_timeout(self):
+        """Copy the Timeout spinbox into response_timeout if it holds a number"""
+        self._timeout_after_id = None
+        try:
+            self.response_timeout = self.timeout_var.get()
+        except tk.TclError:
+            pass  # Empty or half-typed; keep the previous timeout
     
     def on_operation_change(self):
         """Handle operation type change"""
         operation = self.operation_var.get()
         
-        # Show/hide relevant fields based on operation
-        if operation == "write_single":
-            # Show only register value field
-            self.value_label.grid(row=1, column=0, padx=(0, 10), pady=3, sticky='e')
-            self.reg_value_entry.grid(row=1, column=1, pady=3, sticky='w')
-            # Hide count and values fields
-            self.count_label.grid_remove()
-            self.count_spin.grid_remove()
-            self.values_label.grid_remove()
-            self.values_entry.grid_remove()
-        elif operation == "read_multiple":
-            # Show only count field
-            self.count_label.grid(row=2, column=0, padx=(0, 10), pady=3, sticky='e')
-            self.count_spin.grid(row=2, column=1, pady=3, sticky='w')
-            # Hide value and values fields
-            self.value_label.grid_remove()
-            self.reg_value_entry.grid_remove()
-            self.values_label.grid_remove()
-            self.values_entry.grid_remove()
-        elif operation == "write_multiple":
-            # Show count and values fields
-            self.count_label.grid(row=2, column=0, padx=(0, 10), pady=3, sticky='e')
-            self.count_spin.grid(row=2, column=1, pady=3, sticky='w')
-            self.values_label.grid(row=3, column=0, padx=(0, 10), pady=3, sticky='e')
-            self.values_entry.grid(row=3, column=1, pady=3, sticky='w')
-            # Hide single value field
-            self.value_label.grid_remove()
-            self.reg_value_entry.grid_remove()
-        else:  # read_single
-            # Hide all optional fields
-            self.value_label.grid_remove()
-            self.reg_value_entry.grid_remove()
-            self.count_label.grid_remove()
-            self.count_spin.grid_remove()
-            self.values_label.grid_remove()
-            self.values_entry.grid_remove()
+        # Show the fields this operation uses, hide the rest; only widgets
+        # whose visibility actually changes are touched
+        shown = set(self._op_fields.get(operation, ()))
+        for widget in shown - self._visible_fields:
+            widget.grid(**self._field_grid[widget])
+        for widget in self._visible_fields - shown:
+            widget.grid_remove()
+        self._visible_fields = shown
         
         # Update preview
+        self._schedule_preview()
+    
+    def _read_inputs(self) -> tuple:
+        """Read the inputs the packet is built from, each Tk variable once.
+        
+        Returns (operation, device address, register address text, message
+        ID, *extras), where extras are the fields listed for the operation
+        in _op_inputs. Fields the operation doesn't use are left out, so
+        editing e.g. Values while Read Single is selected isn't a change.
+        
+        Raises:
+            tk.TclError: A numeric field holds a half-typed value
+        """
+        operation = self.operation_var.get()
+        key = [operation, self.device_addr_var.get(), self.reg_addr_var.get(), self.message_id]
+        key += [var.get() for var in self._op_inputs.get(operation, ())]
+        return tuple(key)
+    
+    def _preview_inputs(self):
+        """_read_inputs(), or None if one of the fields is unreadable"""
+        try:
+            return self._read_inputs()
+        except tk.TclError:
+            return None  # Half-typed number; build_packet reports it
+    
+    def _schedule_preview(self, *args):
+        """Queue one update_preview for when Tk goes idle.
+        
+        Several input traces can fire for a single edit; they all share the
+        one queued update.
+        """
+        if self._preview_pending is None:
+            self._preview_pending = self.frame.after_idle(self._do_preview)
+    
+    def _do_preview(self):
+        """Idle callback queued by _schedule_preview"""
+        self._preview_pending = None
         self.update_preview()
     
     def update_preview(self):
-        """Update packet preview with hex bytes and parsed fields"""
+        """Update packet preview with hex bytes and parsed fields.
+        
+        Skipped when none of the inputs changed since the last call, since
+        several traces and the operation radios can all fire for one edit.
+        """
+        key = self._preview_inputs()
+        if key is not None and key == self._preview_key:
+            return
+        self._preview_key = key
+        self._preview_packet = None
+        
         try:
-            packet = self.build_packet(show_errors=False)
+            packet = self.build_packet(show_errors=False, inputs=key)
             if packet:
-                packet_bytes = packet.to_bytes()
+                # Serialized into the shared buffer; the cached view stays
+                # valid until the next preview or send rewrites it
+                n = packet.serialize_into(self._tx_buf)
+                packet_bytes = memoryview(self._tx_buf)[:n]
                 
                 # Format hex bytes with spacing
-                hex_str = " ".join(f"{b:02X}" for b in packet_bytes)
+                hex_str = format_hex(packet_bytes)
+                if key is not None:
+                    self._preview_packet = (packet, packet_bytes, hex_str)
                 
                 # Update hex preview with color coding
                 self.preview_text.delete(1.0, tk.END)
-                self.preview_text.insert(tk.END, hex_str, "hex_data")
-                self.preview_text.insert(tk.END, "\n")
-                self.preview_text.insert(tk.END, "Length: ", "label")
-                self.preview_text.insert(tk.END, f"{len(packet_bytes)} bytes", "value")
+                self.preview_text.insert(tk.END, hex_str, "hex_data", "\n", "",
+                                         "Length: ", "label",
+                                         f"{len(packet_bytes)} bytes", "value")
                 
                 # Parse and display fields with color coding
                 self.parse_packet_fields_with_colors(packet, packet_bytes)
@@ -402,14 +595,12 @@ class HostTab:
             else:
                 # Show informative message when packet can't be built
                 self.preview_text.delete(1.0, tk.END)
-                operation = self.operation_var.get()
-                if operation == "write_multiple":
-                    count = self.count_var.get()
-                    values_str = self.values_var.get().strip()
+                if key is not None and key[0] == "write_multiple":
+                    count, values_str = key[4], key[5].strip()
                     num_values = len(values_str.split(',')) if values_str else 0
                     if num_values != count:
-                        self.preview_text.insert(tk.END, "Count mismatch: ", "error")
-                        self.preview_text.insert(tk.END, f"Count={count}, Values={num_values}", "label")
+                        self.preview_text.insert(tk.END, "Count mismatch: ", "error",
+                                                 f"Count={count}, Values={num_values}", "label")
                     else:
                         self.preview_text.insert(tk.END, "Invalid input format", "error")
                 else:
@@ -419,8 +610,7 @@ class HostTab:
                 self.checksum_label.config(text="Checksum: N/A", fg='gray')
         except Exception as e:
             self.preview_text.delete(1.0, tk.END)
-            self.preview_text.insert(tk.END, "Error: ", "error")
-            self.preview_text.insert(tk.END, str(e), "error")
+            self.preview_text.insert(tk.END, f"Error: {e}", "error")
             self.parsed_text.delete(1.0, tk.END)
             self.checksum_label.config(text="Checksum: Error", fg='red')
     
@@ -430,20 +620,15 @@ class HostTab:
             return "Invalid packet (too short)"
         
         try:
-            start_flag = f"0x{packet_bytes[0]:02X}"
+            labels = self.BYTE_LABELS
+            start_flag = labels[packet_bytes[0]]
             device_addr = packet_bytes[1]
-            message_id = f"0x{packet_bytes[2]:02X}"
+            message_id = labels[packet_bytes[2]]
             length = packet_bytes[3]
-            func_code = f"0x{packet_bytes[4]:02X}"
+            func_code = labels[packet_bytes[4]]
             
             # Decode function
-            func_names = {
-                0x01: "Read Single",
-                0x02: "Write Single", 
-                0x03: "Read Multiple",
-                0x04: "Write Multiple"
-            }
-            func_name = func_names.get(packet_bytes[4], "Unknown")
+            func_name = self.FUNC_NAMES.get(packet_bytes[4], "Unknown")
             
             parsed = f"Start: {start_flag} | Addr: {device_addr} | ID: {message_id}\n"
             parsed += f"Len: {length} | Func: {func_code} ({func_name})"
@@ -468,57 +653,43 @@ class HostTab:
             return
         
         try:
-            start_flag = f"0x{packet_bytes[0]:02X}"
+            labels = self.BYTE_LABELS
+            start_flag = labels[packet_bytes[0]]
             device_addr = packet_bytes[1]
-            message_id = f"0x{packet_bytes[2]:02X}"
+            message_id = labels[packet_bytes[2]]
             length = packet_bytes[3]
-            func_code = f"0x{packet_bytes[4]:02X}"
+            func_code = labels[packet_bytes[4]]
             
             # Decode function
-            func_names = {
-                0x01: "Read Single",
-                0x02: "Write Single", 
-                0x03: "Read Multiple",
-                0x04: "Write Multiple"
-            }
-            func_name = func_names.get(packet_bytes[4], "Unknown")
-            
-            # First line with colored fields
-            self.parsed_text.insert(tk.END, "Start: ", "field_label")
-            self.parsed_text.insert(tk.END, start_flag, "field_value")
-            self.parsed_text.insert(tk.END, " | ", "separator")
-            self.parsed_text.insert(tk.END, "Addr: ", "field_label")
-            self.parsed_text.insert(tk.END, str(device_addr), "address")
-            self.parsed_text.insert(tk.END, " | ", "separator")
-            self.parsed_text.insert(tk.END, "ID: ", "field_label")
-            self.parsed_text.insert(tk.END, message_id, "field_value")
-            self.parsed_text.insert(tk.END, "\n")
+            func_name = self.FUNC_NAMES.get(packet_bytes[4], "Unknown")
             
-            # Second line with function details
-            self.parsed_text.insert(tk.END, "Len: ", "field_label")
-            self.parsed_text.insert(tk.END, str(length), "field_value")
-            self.parsed_text.insert(tk.END, " | ", "separator")
-            self.parsed_text.insert(tk.END, "Func: ", "field_label")
-            self.parsed_text.insert(tk.END, func_code, "func_code")
-            self.parsed_text.insert(tk.END, " (", "separator")
-            self.parsed_text.insert(tk.END, func_name, "func_code")
-            self.parsed_text.insert(tk.END, ")", "separator")
+            # Both lines go in as one insert of (text, tag) pairs
+            segments = [
+                # First line with colored fields
+                "Start: ", "field_label", start_flag, "field_value", " | ", "separator",
+                "Addr: ", "field_label", str(device_addr), "address", " | ", "separator",
+                "ID: ", "field_label", message_id, "field_value", "\n", "",
+                # Second line with function details
+                "Len: ", "field_label", str(length), "field_value", " | ", "separator",
+                "Func: ", "field_label", func_code, "func_code", " (", "separator",
+                func_name, "func_code", ")", "separator",
+            ]
             
             # Add data field info if space allows
             if length > 1 and len(packet_bytes) > 7:
                 data_bytes = packet_bytes[5:-2]  # Exclude checksum
                 if len(data_bytes) >= 2:
                     reg_addr = (data_bytes[0] << 8) | data_bytes[1]
-                    self.parsed_text.insert(tk.END, " | ", "separator")
-                    self.parsed_text.insert(tk.END, "Reg: ", "field_label")
-                    self.parsed_text.insert(tk.END, f"0x{reg_addr:04X}", "address")
+                    segments += [" | ", "separator", "Reg: ", "field_label",
+                                 f"0x{reg_addr:04X}", "address"]
+            
+            self.parsed_text.insert(tk.END, *segments)
             
         except Exception as e:
             self.parsed_text.delete(1.0, tk.END)
-            self.parsed_text.insert(tk.END, "Parse error: ", "error")
-            self.parsed_text.insert(tk.END, str(e), "error")
+            self.parsed_text.insert(tk.END, f"Parse error: {e}", "error")
     
-    def build_packet(self, show_errors=True) -> Optional[Packet]:
+    def build_packet(self, show_errors=True, inputs: Optional[tuple] = None) -> Optional[Packet]:
         """Build packet based on current UI settings.
         
         Reads the current UI configuration and creates the appropriate
@@ -526,43 +697,23 @@ class HostTab:
         
         Args:
             show_errors: If True, show error dialogs. If False, return None silently.
+            inputs: Values already read by _read_inputs(), to skip reading them again
         
         Returns:
             Configured packet ready for transmission, or None if invalid
         """
         try:
-            device_addr = self.device_addr_var.get()
-            operation = self.operation_var.get()
+            if inputs is None:
+                inputs = self._read_inputs()
+            operation, device_addr, reg_addr_str, _, *extras = inputs
             
             # Parse register address
-            reg_addr = int(self.reg_addr_var.get(), 16)
+            reg_addr = int(reg_addr_str, 16)
             
-            if operation == "read_single":
-                return PacketBuilder.read_single_request(device_addr, self.message_id, reg_addr)
-                
-            elif operation == "write_single":
-                reg_value = int(self.reg_value_var.get(), 16)
-                return PacketBuilder.write_single_request(device_addr, self.message_id, reg_addr, reg_value)
-                
-            elif operation == "read_multiple":
-                count = self.count_var.get()
-                return PacketBuilder.read_multiple_request(device_addr, self.message_id, reg_addr, count)
-                
-            elif operation == "write_multiple":
-                count = self.count_var.get()
-                # Parse values
-                values_str = self.values_var.get().strip()
-                values = []
-                for v in values_str.split(','):
-                    values.append(int(v.strip(), 16))
-                
-                # Check count matches
-                if len(values) != count:
-                    if show_errors:
-                        messagebox.showerror("Error", f"Count ({count}) doesn't match number of values ({len(values)})")
-                    return None
-                
-                return PacketBuilder.write_multiple_request(device_addr, self.message_id, reg_addr, values)
+            builder = self._op_builders.get(operation)
+            if builder is None:
+                return None
+            return builder(device_addr, reg_addr, show_errors, *extras)
                 
         except ValueError as e:
             if show_errors:
@@ -573,6 +724,41 @@ class HostTab:
                 messagebox.showerror("Error", f"Failed to build packet: {str(e)}")
             return None
     
+    def _build_read_single(self, device_addr: int, reg_addr: int, show_errors: bool) -> Packet:
+        return PacketBuilder.read_single_request(device_addr, self.message_id, reg_addr)
+    
+    def _build_write_single(self, device_addr: int, reg_addr: int, show_errors: bool,
+                            reg_value_str: str) -> Packet:
+        reg_value = int(reg_value_str, 16)
+        return PacketBuilder.write_single_request(device_addr, self.message_id, reg_addr, reg_value)
+    
+    def _build_read_multiple(self, device_addr: int, reg_addr: int, show_errors: bool,
+                             count: int) -> Packet:
+        return PacketBuilder.read_multiple_request(device_addr, self.message_id, reg_addr, count)
+    
+    def _build_write_multiple(self, device_addr: int, reg_addr: int, show_errors: bool,
+                              count: int, values_str: str) -> Optional[Packet]:
+        # Parse values, reusing the last result while the text is unchanged
+        values_str = values_str.strip()
+        cached_str, values = self._values_cache
+        if values_str == cached_str:
+            items = values
+        else:
+            items = values_str.split(',')
+            values = None
+        
+        # Check count matches before converting anything
+        if len(items) != count:
+            if show_errors:
+                messagebox.showerror("Error", f"Count ({count}) doesn't match number of values ({len(items)})")
+            return None
+        
+        if values is None:
+            values = [int(v, 16) for v in items]  # int() ignores the spaces
+            self._values_cache = (values_str, values)
+        
+        return PacketBuilder.write_multiple_request(device_addr, self.message_id, reg_addr, values)
+    
     def send_request(self):
         """Send the request packet.
         
@@ -585,44 +771,65 @@ class HostTab:
             messagebox.showerror("Error", "Serial port not connected")
             return
         
-        packet = self.build_packet()
-        if not packet:
-            return
+        # The preview normally holds this exact packet already
+        key = self._preview_inputs()
+        if self._preview_packet is not None and key is not None and key == self._preview_key:
+            packet, packet_bytes, hex_str = self._preview_packet
+        else:
+            packet = self.build_packet(inputs=key)
+            if not packet:
+                return
+            packet_bytes = None
+            self._preview_packet = None  # Its bytes are about to be overwritten
         
         try:
+            if packet_bytes is None:
+                n = packet.serialize_into(self._tx_buf)
+                packet_bytes = memoryview(self._tx_buf)[:n]
+                hex_str = format_hex(packet_bytes)
+            
             # Send packet
-            packet_bytes = packet.to_bytes()
             serial_port.write(packet_bytes)
             
             # Log the request
-            timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
-            self.log_display.insert(tk.END, f"[{timestamp}] TX Request (ID: {self.message_id:02X}):\n", "system")
+            timestamp = format_timestamp()
             
-            # Format packet display
-            hex_str = " ".join(f"{b:02X}" for b in packet_bytes)
-            self.log_display.insert(tk.END, f"  Raw: {hex_str}\n", "request")
-            
-            # Parse and display
-            operation = self.operation_var.get()
-            self.log_display.insert(tk.END, f"  Operation: {operation.replace('_', ' ').title()}\n", "request")
-            self.log_display.insert(tk.END, f"  Device Address: {packet.device_address}\n", "request")
+            # Queue the entry; process_responses inserts it with the next batch
+            operation = key[0]  # A packet was built, so the inputs were readable
+            op_title = operation.replace('_', ' ').title()
+            self._ui_queue.append([
+                f"[{timestamp}] TX Request (ID: {self.message_id:02X}):\n", "system",
+                f"  Raw: {hex_str}\n"
+                f"  Operation: {op_title}\n"
+                f"  Device Address: {packet.device_address}\n", "request"])
             
             # Store pending request for timeout handling
-            self.pending_requests[self.message_id] = {
-                'timestamp': datetime.datetime.now(),
-                'operation': operation,
-                'packet': packet
-            }
+            msg_id = self.message_id
+            ticks = -(-self.response_timeout // self.WHEEL_TICK_MS) + 1
+            with self._pending_lock:
+                if not self._pending_mask:
+                    # Idle wheel may lag by a poll interval; restart it from now
+                    self._wheel_time = time.monotonic()
+                elif self._pending_mask & (1 << msg_id):
+                    # ID wrapped around while the old request was still pending
+                    self._wheel[self._pending_slot[msg_id]].discard(msg_id)
+                slot = (self._wheel_cursor + ticks) % self.WHEEL_SLOTS
+                self._wheel[slot].add(msg_id)
+                self._pending_slot[msg_id] = slot
+                self._pending_rounds[msg_id] = (ticks - 1) // self.WHEEL_SLOTS
+                self._pending_ts[msg_id] = time.monotonic()
+                self._pending_op[msg_id] = op_title
+                self._pending_packet[msg_id] = packet
+                self._pending_mask |= 1 << msg_id
             
-            # Schedule timeout check
-            self.frame.after(self.response_timeout, lambda: self.check_timeout(self.message_id))
+            self._poll_soon()
             
             # Increment message ID
             self.message_id = (self.message_id + 1) & 0xFF
             self.msg_id_var.set(f"{self.message_id:02X}")
-            
-            # Auto-scroll
-            self.log_display.see(tk.END)
+            # on_message_id_change sees the ID already current and skips
+            # the preview, so refresh it here for the new Message ID
+            self._schedule_preview()
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to send packet: {str(e)}")
@@ -630,73 +837,207 @@ class HostTab:
     def check_timeout(self, msg_id: int):
         """Check if a request has timed out.
         
-        Called after the timeout period to check if a response was received.
+        Called by _advance_wheel once the timeout period has passed.
         If the request is still pending, it's marked as timed out.
         
         Args:
             msg_id: Message ID to check for timeout
         """
-        if msg_id in self.pending_requests:
-            request = self.pending_requests.pop(msg_id)
-            
-            timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
-            self.log_display.insert(tk.END, f"[{timestamp}] Timeout for Message ID {msg_id:02X}\n", "timeout")
-            self.log_display.insert(tk.END, f"  No response received within {self.response_timeout}ms\n\n", "timeout")
-            self.log_display.see(tk.END)
+        taken = self._take_pending(msg_id)
+        if taken is not None:
+            timestamp = format_timestamp()
+            self._ui_queue.append([
+                f"[{timestamp}] Timeout for Message ID {msg_id:02X} ({taken[1]})\n"
+                f"  No response received within {self.response_timeout}ms\n\n", "timeout"])
+    
+    def _take_pending(self, msg_id: int) -> Optional[Tuple[float, str]]:
+        """Clear the pending request for msg_id.
+        
+        Returns its (send time, operation title), or None if nothing was
+        pending. Both are read under the lock, before a reused ID can
+        overwrite them.
+        """
+        bit = 1 << msg_id
+        with self._pending_lock:
+            if not self._pending_mask & bit:
+                return None
+            self._pending_mask &= ~bit
+            self._pending_packet[msg_id] = None
+            self._wheel[self._pending_slot[msg_id]].discard(msg_id)
+            return self._pending_ts[msg_id], self._pending_op[msg_id]
     
     def handle_raw_data(self, data: bytes):
-        """Handle raw serial data from main thread"""
-        try:
-            self.response_buffer.extend(data)
-            self.process_response_buffer()
-        except Exception as e:
-            print(f"Error handling raw data in host tab: {e}")
+        """Handle raw serial data from main thread.
+        
+        Only queues the data for _parse_worker; Tk widgets are not
+        thread-safe, and parsing shouldn't hold up the read loop either.
+        """
+        if data:
+            self._rx_queue.put(data)
+    
+    def _parse_worker(self):
+        """Background thread: extract, parse and format responses.
+        
+        Takes everything queued by handle_raw_data in one go, runs it
+        through process_response_buffer(), and leaves the finished log
+        entries in _ui_queue for process_responses() to insert.
+        """
+        rx_queue = self._rx_queue
+        while True:
+            self.response_buffer.extend(rx_queue.get())
+            try:
+                while True:
+                    self.response_buffer.extend(rx_queue.get_nowait())
+            except queue.Empty:
+                pass
+            try:
+                self.process_response_buffer()
+            except Exception as e:
+                print(f"Error handling raw data in host tab: {e}")
     
     def process_response_buffer(self):
-        """Process the response buffer for complete packets"""
+        """Process the response buffer for complete packets.
+        
+        Consumed bytes are skipped by advancing a read index instead of
+        re-slicing the buffer; the buffer is compacted in one step once
+        the consumed prefix grows past BUFFER_COMPACT_SIZE. A start flag
+        that turns out not to begin a valid frame only costs one byte.
+        """
+        buf = self.response_buffer
+        head = self._rb_head
+        size = len(buf)
+        view = memoryview(buf)
+        # Bound once; the loop below runs per frame and per false start flag
+        function_codes = self.FUNCTION_CODES
+        find = buf.find
+        decode_into = Packet.from_bytes_into
+        rx_packet = self._rx_packet
+        handle_response = self.handle_response
         try:
             # Try to parse packets
-            while len(self.response_buffer) > 0:
+            while head < size:
                 # Look for start flag
-                start_idx = self.response_buffer.find(0x7E)
+                start_idx = find(0x7E, head)
                 if start_idx == -1:
-                    self.response_buffer.clear()
+                    head = size
                     break
                 
-                # Remove data before start flag
-                if start_idx > 0:
-                    self.response_buffer = self.response_buffer[start_idx:]
+                # Skip data before start flag
+                head = start_idx
                 
                 # Check if we have enough data for header
-                if len(self.response_buffer) < 6:
+                if size - head < 6:
                     break
                 
+                # A 0x7E in line noise rarely has a plausible function code
+                # after it; resync right away instead of waiting for its "length"
+                if buf[head + 4] not in function_codes:
+                    head += 1
+                    continue
+                
                 # Get message length
-                msg_length = self.response_buffer[3]
+                msg_length = buf[head + 3]
                 total_length = 6 + msg_length  # Header + data + checksum
                 
                 # Check if we have complete packet
-                if len(self.response_buffer) < total_length:
+                if size - head < total_length:
                     break
                 
-                # Extract packet
-                packet_data = bytes(self.response_buffer[:total_length])
-                self.response_buffer = self.response_buffer[total_length:]
-                
-                # Parse packet
-                packet = Packet.from_bytes(packet_data)
+                # Parse the packet in place into the reused instance (valid
+                # until the next packet), then advance the read index past it
+                start = head
+                head += total_length
+                packet = decode_into(buf, rx_packet, start)
                 if packet:
-                    self.handle_response(packet, packet_data)
+                    # Hand over the wire bytes for logging; released right after
+                    with view[start:head] as raw:
+                        handle_response(packet, raw)
+                else:
+                    head = start + 1  # Bad checksum: the real frame may start inside it
                 
         except Exception as e:
             print(f"Error processing response buffer: {e}")
+        finally:
+            view.release()  # The buffer can't be resized while exported
+            if head >= size:
+                buf.clear()
+                head = 0
+            elif head > self.BUFFER_COMPACT_SIZE:
+                del buf[:head]
+                head = 0
+            self._rb_head = head
     
     def process_responses(self):
-        """Legacy method - now just schedules next check"""
-        # Schedule next check - reduced interval for better responsiveness
-        self.frame.after(5, self.process_responses)
+        """Insert queued log entries, then reschedule.
+        
+        Entries come from send_request, check_timeout and the parse worker.
+        Everything ready since the last check goes into the log with one
+        insert, with adjacent runs of the same tag merged. Polls every
+        POLL_MIN_MS while responses are arriving or a request awaits its
+        response, and doubles the interval up to POLL_MAX_MS when idle.
+        """
+        self._advance_wheel()
+        entries = self._ui_queue
+        got_data = bool(entries)
+        if got_data:
+            segments = []
+            popleft = entries.popleft
+            while entries:
+                entry = popleft()
+                for i in range(0, len(entry), 2):
+                    text, tag = entry[i], entry[i + 1]
+                    if segments and segments[-1] == tag:
+                        segments[-2] += text
+                    else:
+                        segments += (text, tag)
+            self._append_log(*segments)
+        
+        if got_data or self._pending_mask:
+            self._poll_interval = self.POLL_MIN_MS
+        else:
+            self._poll_interval = min(self.POLL_MAX_MS, self._poll_interval * 2)
+        self._poll_after_id = self.frame.after(self._poll_interval, self.process_responses)
     
-    def handle_response(self, packet: Packet, raw_data: bytes = None):
+    def _advance_wheel(self):
+        """Turn the timeout wheel up to now and time out the IDs in passed slots.
+        
+        A request is placed one tick beyond its timeout, so it never expires
+        early; it may expire up to one tick plus one poll interval late.
+        Timeouts longer than one turn wait out their remaining rounds first.
+        """
+        now = time.monotonic()
+        if not self._pending_mask:
+            # Nothing in the wheel, so jump the cursor instead of stepping it
+            self._wheel_time = now
+            return
+        tick = self.WHEEL_TICK_MS / 1000
+        rounds = self._pending_rounds
+        expired = []
+        with self._pending_lock:
+            while self._wheel_time + tick <= now:
+                self._wheel_time += tick
+                self._wheel_cursor = (self._wheel_cursor + 1) % self.WHEEL_SLOTS
+                slot = self._wheel[self._wheel_cursor]
+                if slot:
+                    due = []
+                    for msg_id in slot:
+                        if rounds[msg_id]:
+                            rounds[msg_id] -= 1
+                        else:
+                            due.append(msg_id)
+                    slot.difference_update(due)
+                    expired += due
+        for msg_id in expired:
+            self.check_timeout(msg_id)
+    
+    def _poll_soon(self):
+        """Bring an idle-length response poll forward to POLL_MIN_MS"""
+        if self._poll_interval > self.POLL_MIN_MS and self._poll_after_id is not None:
+            self.frame.after_cancel(self._poll_after_id)
+            self._poll_interval = self.POLL_MIN_MS
+            self._poll_after_id = self.frame.after(self._poll_interval, self.process_responses)
+    
+    def handle_response(self, packet: Packet, raw_data: Optional[memoryview] = None):
         """Handle received response packet.
         
         Processes response packets from devices, matches them to pending
@@ -706,73 +1047,79 @@ class HostTab:
             packet: Parsed response packet
             raw_data: Original raw bytes (for display)
         """
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        
         # Check if this matches a pending request
-        if packet.message_id in self.pending_requests:
-            request = self.pending_requests.pop(packet.message_id)
-            elapsed = (datetime.datetime.now() - request['timestamp']).total_seconds() * 1000
+        taken = self._take_pending(packet.message_id)
+        if taken is None and not self._log_unexpected:
+            return  # Not ours; skip the formatting entirely
+        
+        timestamp = format_timestamp()
+        if taken is not None:
+            sent_at, op_title = taken
+            elapsed = (time.monotonic() - sent_at) * 1000
             
-            self.log_display.insert(tk.END, 
-                f"[{timestamp}] RX Response (ID: {packet.message_id:02X}, Time: {elapsed:.1f}ms):\n", "system")
+            header = (f"[{timestamp}] RX {op_title} Response "
+                      f"(ID: {packet.message_id:02X}, Time: {elapsed:.1f}ms):\n")
         else:
-            self.log_display.insert(tk.END, 
-                f"[{timestamp}] RX Unexpected Response (ID: {packet.message_id:02X}):\n", "system")
+            header = f"[{timestamp}] RX Unexpected Response (ID: {packet.message_id:02X}):\n"
         
         # Display raw packet - use original raw data if available, otherwise reconstruct
         if raw_data is not None:
             packet_bytes = raw_data
         else:
             packet_bytes = packet.to_bytes()
-        hex_str = " ".join(f"{b:02X}" for b in packet_bytes)
-        self.log_display.insert(tk.END, f"  Raw: {hex_str}\n", "response")
+        hex_str = format_hex(packet_bytes)
+        
+        # Collect every line first so the whole entry is a single insert
+        segments = [header, "system", f"  Raw: {hex_str}\n", "response"]
         
         # Parse and display response
         parsed = PacketParser.parse_response(packet)
         if parsed:
             if parsed.get('is_error'):
-                self.log_display.insert(tk.END, f"  ERROR: {parsed['error_description']}\n", "error")
-                self.log_display.insert(tk.END, f"  Error Code: 0x{parsed['error_code']:02X}\n", "error")
+                segments += [
+                    f"  ERROR: {parsed['error_description']}\n"
+                    f"  Error Code: 0x{parsed['error_code']:02X}\n", "error"]
             else:
-                func = packet.function_code
-                if func == FunctionCode.READ_SINGLE_RESP:
-                    self.log_display.insert(tk.END, 
-                        f"  Read Single Response:\n", "response")
-                    self.log_display.insert(tk.END, 
-                        f"    Address: 0x{parsed['register_address']:04X}\n", "response")
-                    self.log_display.insert(tk.END, 
-                        f"    Value: 0x{parsed['register_value']:04X} ({parsed['register_value']})\n", "response")
-                        
-                elif func == FunctionCode.WRITE_SINGLE_RESP:
-                    self.log_display.insert(tk.END, 
-                        f"  Write Single Response:\n", "response")
-                    self.log_display.insert(tk.END, 
-                        f"    Address: 0x{parsed['register_address']:04X}\n", "response")
-                    self.log_display.insert(tk.END, 
-                        f"    Value: 0x{parsed['register_value']:04X}\n", "response")
-                        
-                elif func == FunctionCode.READ_MULTIPLE_RESP:
-                    self.log_display.insert(tk.END, 
-                        f"  Read Multiple Response:\n", "response")
-                    self.log_display.insert(tk.END, 
-                        f"    Starting Address: 0x{parsed['register_address']:04X}\n", "response")
-                    self.log_display.insert(tk.END, 
-                        f"    Count: {parsed['count']}\n", "response")
-                    values_str = ", ".join(f"0x{v:04X}" for v in parsed.get('values', []))
-                    self.log_display.insert(tk.END, 
-                        f"    Values: [{values_str}]\n", "response")
-                        
-                elif func == FunctionCode.WRITE_MULTIPLE_RESP:
-                    self.log_display.insert(tk.END, 
-                        f"  Write Multiple Response:\n", "response")
-                    self.log_display.insert(tk.END, 
-                        f"    Starting Address: 0x{parsed['register_address']:04X}\n", "response")
-                    self.log_display.insert(tk.END, 
-                        f"    Count Written: {parsed['count']}\n", "response")
-        
-        self.log_display.insert(tk.END, "\n")
+                template = self.RESPONSE_LOG_FORMATS.get(packet.function_code)
+                if template:
+                    values_str = format_words(parsed['values']) if 'values' in parsed else ""
+                    segments += [template.format(values_str=values_str, **parsed), "response"]
+        
+        segments += ["\n", ""]
+        self._ui_queue.append(segments)  # Inserted on the GUI thread by process_responses
+    
+    def _append_log(self, *segments):
+        """Append to the log, trimming the oldest lines past LOG_MAX_LINES.
+        
+        Args:
+            *segments: Alternating text and tag arguments, as for Text.insert
+        """
+        self.log_display.insert(tk.END, *segments)
+        
+        count = self._log_lines
+        for text in segments[::2]:
+            count += text.count("\n")
+        if count > self.LOG_MAX_LINES:
+            # Drop the older half in one delete rather than trimming per insert
+            keep = self.LOG_MAX_LINES // 2
+            self.log_display.delete("1.0", f"{count - keep + 1}.0")
+            count = keep
+        self._log_lines = count
+        
+        self._schedule_see_end()
+    
+    def _schedule_see_end(self):
+        """Scroll the log to the end once the current burst of appends is done"""
+        if not self._see_pending:
+            self._see_pending = True
+            self.frame.after_idle(self._flush_see_end)
+    
+    def _flush_see_end(self):
+        """Idle callback queued by _schedule_see_end"""
+        self._see_pending = False
         self.log_display.see(tk.END)
     
     def clear_log(self):
         """Clear the communication log"""
-        self.log_display.delete(1.0, tk.END)
\ No newline at end of file
+        self.log_display.delete(1.0, tk.END)
+        self._log_lines = 0
\ No newline at end of file
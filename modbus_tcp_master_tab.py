@@ -8,16 +8,35 @@ from tkinter import ttk, scrolledtext, messagebox
 import socket
 import struct
 import threading
-import datetime
-from typing import Optional, List, Dict, Any
+import collections
+import time
+from typing import Optional, List, Dict, Tuple, Callable
 from modbus_tcp_protocol import (
     ModbusTCPFrame, ModbusTCPBuilder, ModbusTCPParser,
-    ModbusFunctionCode, ModbusException
+    ModbusFunctionCode, ModbusException, merge_read_ranges
 )
+from protocol import decode_words, format_hex, format_words, format_timestamp
 from ui_styles import (
     FONTS, SPACING, COLORS, configure_text_widget
 )
 
+# Debug decoders read fields in place from the raw frame
+_MBAP_HEADER = struct.Struct('>HHHB')  # Transaction, protocol, length, unit ID
+_U16 = struct.Struct('>H')
+MAX_MBAP_LENGTH = 254  # Unit ID + PDU; a Modbus TCP ADU is at most 260 bytes
+
+
+class PendingRequest:
+    """A sent request awaiting its response, keyed by transaction ID"""
+    __slots__ = ('timestamp', 'operation', 'frame', 'on_values')
+    
+    def __init__(self, timestamp: float, operation: str, frame: ModbusTCPFrame,
+                 on_values: Optional[Callable[[List[int]], None]] = None):
+        self.timestamp = timestamp  # time.monotonic() when the request was sent
+        self.operation = operation  # Operation name from the UI
+        self.frame = frame          # Request frame as sent
+        self.on_values = on_values  # Given the registers of a successful read
+
 
 class ModbusTCPMasterTab:
     """Modbus TCP Master implementation.
@@ -28,6 +47,18 @@ class ModbusTCPMasterTab:
     
     # Using shared styling system from ui_styles module
     
+    LOG_MAX_LINES = 5000  # Log is trimmed to half this once exceeded
+    LOG_FLUSH_MS = 100  # add_log batches lines for this long before one insert
+    RX_BUFFER_SIZE = 4096  # Receive buffer; holds many maximum-size (260 byte) frames
+    
+    # Exception code -> name shown by decode_response_for_debug
+    EXCEPTION_NAMES = {
+        0x01: "ILLEGAL_FUNCTION",
+        0x02: "ILLEGAL_DATA_ADDRESS",
+        0x03: "ILLEGAL_DATA_VALUE",
+        0x04: "SLAVE_DEVICE_FAILURE"
+    }
+    
     def _init_style(self):
         """Initialize ttk styles for professional appearance"""
         style = ttk.Style()
@@ -60,13 +91,12 @@ class ModbusTCPMasterTab:
         # Client state
         self.client_socket: Optional[socket.socket] = None
         self.is_connected = False
-        self.connection_lock = threading.Lock()
         self.receive_thread: Optional[threading.Thread] = None
         
         # Modbus state
         self.transaction_id = 1
         self.unit_id = 1
-        self.pending_requests: Dict[int, Dict[str, Any]] = {}
+        self.pending_requests: Dict[int, PendingRequest] = {}
         self.response_timeout = 3000  # milliseconds
         
         # Statistics
@@ -77,6 +107,14 @@ class ModbusTCPMasterTab:
         
         # UI state
         self.auto_scroll = tk.BooleanVar(value=True)
+        self._log_lines = 0  # Lines currently held by log_display
+        # (text, tag) lines waiting for _flush_log; older lines fall off if
+        # more arrive than the log would keep anyway
+        self._log_buffer = collections.deque(maxlen=self.LOG_MAX_LINES)
+        self._log_flush_pending = False
+        self._preview_pending = None  # after_idle id of a queued update_preview
+        self._preview_key = None  # Inputs the preview was last rendered from
+        self._values_cache = ("", [])  # Last Values text and the list parsed from it
         
         # Build UI
         self.create_widgets()
@@ -194,7 +232,7 @@ class ModbusTCPMasterTab:
         self.start_addr_var = tk.StringVar(value="0000")
         self.start_addr_entry = ttk.Entry(params_frame, textvariable=self.start_addr_var, width=8)
         self.start_addr_entry.grid(row=0, column=1, padx=(5, 2), pady=2, sticky=tk.W)
-        self.start_addr_var.trace('w', lambda *args: self.update_preview())
+        self.start_addr_var.trace('w', self._schedule_preview)
         
         ttk.Label(params_frame, text="(hex)", font=("Segoe UI", 8), foreground="#6B7280").grid(row=0, column=2, sticky=tk.W, pady=2)
         
@@ -204,13 +242,13 @@ class ModbusTCPMasterTab:
         self.count_var = tk.IntVar(value=1)
         self.count_spin = ttk.Spinbox(params_frame, from_=1, to=125, textvariable=self.count_var, width=8)
         self.count_spin.grid(row=1, column=1, padx=(5, 0), pady=2, sticky=tk.W)
-        self.count_var.trace('w', lambda *args: self.update_preview())
+        self.count_var.trace('w', self._schedule_preview)
         
         # Values for write operation
         self.values_label = ttk.Label(params_frame, text="Values (hex):")
         self.values_var = tk.StringVar(value="0000,0001,0002")
         self.values_entry = ttk.Entry(params_frame, textvariable=self.values_var, width=25)
-        self.values_var.trace('w', lambda *args: self.update_preview())
+        self.values_var.trace('w', self._schedule_preview)
         
         # Compact send button
         send_frame = ttk.Frame(request_frame)
@@ -337,27 +375,22 @@ class ModbusTCPMasterTab:
         
         try:
             # Parse MBAP header
-            transaction_id, protocol_id, length, unit_id = struct.unpack('>HHHB', request_data[:7])
+            transaction_id, protocol_id, length, unit_id = _MBAP_HEADER.unpack_from(request_data)
             function_code = request_data[7]
             
             if function_code == 0x03:  # Read Holding Registers
-                start_addr = struct.unpack('>H', request_data[8:10])[0] if len(request_data) >= 10 else 0
-                count = struct.unpack('>H', request_data[10:12])[0] if len(request_data) >= 12 else 0
+                start_addr = _U16.unpack_from(request_data, 8)[0] if len(request_data) >= 10 else 0
+                count = _U16.unpack_from(request_data, 10)[0] if len(request_data) >= 12 else 0
                 return f"Read Request - {count} registers from 0x{start_addr:04X} to 0x{start_addr + count - 1:04X}"
             
             elif function_code == 0x10:  # Write Multiple Registers
-                start_addr = struct.unpack('>H', request_data[8:10])[0] if len(request_data) >= 10 else 0
-                count = struct.unpack('>H', request_data[10:12])[0] if len(request_data) >= 12 else 0
+                start_addr = _U16.unpack_from(request_data, 8)[0] if len(request_data) >= 10 else 0
+                count = _U16.unpack_from(request_data, 10)[0] if len(request_data) >= 12 else 0
                 byte_count = request_data[12] if len(request_data) > 12 else 0
                 
                 # Extract register values
-                values = []
-                reg_index = 0
-                for i in range(13, 13 + byte_count, 2):
-                    if i + 1 < len(request_data):
-                        value = struct.unpack('>H', request_data[i:i+2])[0]
-                        values.append(f"[{reg_index}]=0x{value:04X}")
-                        reg_index += 1
+                registers = decode_words(request_data, 13, byte_count // 2)
+                values = [f"[{i}]=0x{value:04X}" for i, value in enumerate(registers)]
                 
                 if count <= 8:
                     values_str = " ".join(values)
@@ -383,19 +416,13 @@ class ModbusTCPMasterTab:
         
         try:
             # Parse MBAP header
-            transaction_id, protocol_id, length, unit_id = struct.unpack('>HHHB', response_data[:7])
+            transaction_id, protocol_id, length, unit_id = _MBAP_HEADER.unpack_from(response_data)
             function_code = response_data[7]
             
             # Check if it's an exception response
             if function_code & 0x80:
                 exception_code = response_data[8] if len(response_data) > 8 else 0
-                exception_names = {
-                    0x01: "ILLEGAL_FUNCTION",
-                    0x02: "ILLEGAL_DATA_ADDRESS", 
-                    0x03: "ILLEGAL_DATA_VALUE",
-                    0x04: "SLAVE_DEVICE_FAILURE"
-                }
-                exception_name = exception_names.get(exception_code, f"UNKNOWN_0x{exception_code:02X}")
+                exception_name = self.EXCEPTION_NAMES.get(exception_code, f"UNKNOWN_0x{exception_code:02X}")
                 return f"Exception Response - {exception_name} (0x{exception_code:02X})"
             
             # Decode based on function code
@@ -404,13 +431,8 @@ class ModbusTCPMasterTab:
                 num_registers = byte_count // 2
                 
                 # Extract ALL register values with indices
-                values = []
-                reg_index = 0
-                for i in range(9, 9 + byte_count, 2):
-                    if i + 1 < len(response_data):
-                        value = struct.unpack('>H', response_data[i:i+2])[0]
-                        values.append(f"[{reg_index}]=0x{value:04X}")
-                        reg_index += 1
+                registers = decode_words(response_data, 9, byte_count // 2)
+                values = [f"[{i}]=0x{value:04X}" for i, value in enumerate(registers)]
                 
                 # Format output based on number of registers
                 if num_registers <= 8:
@@ -425,8 +447,8 @@ class ModbusTCPMasterTab:
                     return f"Read Response ({num_registers} registers):\n{values_str}"
             
             elif function_code == 0x10:  # Write Multiple Registers Response
-                start_addr = struct.unpack('>H', response_data[8:10])[0] if len(response_data) >= 10 else 0
-                quantity = struct.unpack('>H', response_data[10:12])[0] if len(response_data) >= 12 else 0
+                start_addr = _U16.unpack_from(response_data, 8)[0] if len(response_data) >= 10 else 0
+                quantity = _U16.unpack_from(response_data, 10)[0] if len(response_data) >= 12 else 0
                 return f"Write Response - Wrote {quantity} registers from 0x{start_addr:04X} to 0x{start_addr + quantity - 1:04X}"
             
             else:
@@ -440,51 +462,68 @@ class ModbusTCPMasterTab:
         """Update response timeout"""
         self.response_timeout = self.timeout_var.get()
     
+    def _schedule_preview(self, *args):
+        """Queue one update_preview for when Tk goes idle.
+        
+        Each keystroke in an input fires its trace; a burst of them shares
+        the one queued update.
+        """
+        if self._preview_pending is None:
+            self._preview_pending = self.frame.after_idle(self._do_preview)
+    
+    def _do_preview(self):
+        """Idle callback queued by _schedule_preview"""
+        self._preview_pending = None
+        self.update_preview()
+    
     def update_preview(self):
-        """Update request preview"""
+        """Update request preview.
+        
+        Skipped when nothing the preview shows has changed since the last
+        call, e.g. a trace firing for a variable set to its current value.
+        """
+        operation = self.operation_var.get()
+        start_text = self.start_addr_var.get()
+        operand = self.count_var.get() if operation == "read" else self.values_var.get()
+        key = (operation, start_text, operand, self.transaction_id, self.unit_id)
+        if key == self._preview_key:
+            return
+        self._preview_key = key
+        
         try:
             self.update_operation_ui()
             
-            operation = self.operation_var.get()
-            start_addr = int(self.start_addr_var.get(), 16)
+            start_addr = int(start_text, 16)
             
             self.preview_text.config(state=tk.NORMAL)
             self.preview_text.delete(1.0, tk.END)
             
             if operation == "read":
-                count = self.count_var.get()
+                count = operand
                 
                 # Build preview frame
                 frame = ModbusTCPBuilder.read_holding_registers_request(
                     self.transaction_id, self.unit_id, start_addr, count)
                 
-                self.preview_text.insert(tk.END, "Multi Read Request:\n", "header")
-                self.preview_text.insert(tk.END, "  Transaction ID: ", "field")
-                self.preview_text.insert(tk.END, f"0x{frame.transaction_id:04X}\n", "value")
-                self.preview_text.insert(tk.END, "  Unit ID: ", "field")
-                self.preview_text.insert(tk.END, f"{frame.unit_id}\n", "value")
-                self.preview_text.insert(tk.END, "  Function: ", "field")
-                self.preview_text.insert(tk.END, "Read Holding Registers (0x03)\n", "value")
-                self.preview_text.insert(tk.END, "  Start Address: ", "field")
-                self.preview_text.insert(tk.END, f"0x{start_addr:04X}", "address")
-                self.preview_text.insert(tk.END, f" ({start_addr})\n", "value")
-                self.preview_text.insert(tk.END, "  Count: ", "field")
-                self.preview_text.insert(tk.END, f"{count}\n\n", "value")
-                
+                # Whole preview as one insert of (text, tag) pairs
                 frame_bytes = frame.to_bytes()
-                hex_str = " ".join(f"{b:02X}" for b in frame_bytes)
-                self.preview_text.insert(tk.END, f"Raw bytes ({len(frame_bytes)}):\n", "header")
-                self.preview_text.insert(tk.END, hex_str, "hex")
+                self.preview_text.insert(tk.END,
+                    "Multi Read Request:\n", "header",
+                    "  Transaction ID: ", "field", f"0x{frame.transaction_id:04X}\n", "value",
+                    "  Unit ID: ", "field", f"{frame.unit_id}\n", "value",
+                    "  Function: ", "field", "Read Holding Registers (0x03)\n", "value",
+                    "  Start Address: ", "field", f"0x{start_addr:04X}", "address",
+                    f" ({start_addr})\n", "value",
+                    "  Count: ", "field", f"{count}\n\n", "value",
+                    f"Raw bytes ({len(frame_bytes)}):\n", "header", format_hex(frame_bytes), "hex")
                 
             else:  # write
                 try:
-                    values_str = self.values_var.get().strip()
+                    values_str = operand.strip()
                     if not values_str:
                         raise ValueError("No values specified")
                     
-                    values = []
-                    for v in values_str.split(','):
-                        values.append(int(v.strip(), 16))
+                    values = self._parse_values(values_str)
                     
                     if not values:
                         raise ValueError("No valid values")
@@ -493,34 +532,25 @@ class ModbusTCPMasterTab:
                     frame = ModbusTCPBuilder.write_multiple_registers_request(
                         self.transaction_id, self.unit_id, start_addr, values)
                     
-                    self.preview_text.insert(tk.END, "Multi Write Request:\n", "header")
-                    self.preview_text.insert(tk.END, "  Transaction ID: ", "field")
-                    self.preview_text.insert(tk.END, f"0x{frame.transaction_id:04X}\n", "value")
-                    self.preview_text.insert(tk.END, "  Unit ID: ", "field")
-                    self.preview_text.insert(tk.END, f"{frame.unit_id}\n", "value")
-                    self.preview_text.insert(tk.END, "  Function: ", "field")
-                    self.preview_text.insert(tk.END, "Write Multiple Registers (0x10)\n", "value")
-                    self.preview_text.insert(tk.END, "  Start Address: ", "field")
-                    self.preview_text.insert(tk.END, f"0x{start_addr:04X}", "address")
-                    self.preview_text.insert(tk.END, f" ({start_addr})\n", "value")
-                    self.preview_text.insert(tk.END, "  Count: ", "field")
-                    self.preview_text.insert(tk.END, f"{len(values)}\n", "value")
-                    
-                    values_str = ", ".join(f"0x{v:04X}" for v in values[:8])
+                    values_str = format_words(values[:8])
                     if len(values) > 8:
                         values_str += f"... ({len(values)} total)"
-                    self.preview_text.insert(tk.END, "  Values: [", "field")
-                    self.preview_text.insert(tk.END, values_str, "hex")
-                    self.preview_text.insert(tk.END, "]\n\n", "field")
                     
+                    # Whole preview as one insert of (text, tag) pairs
                     frame_bytes = frame.to_bytes()
-                    hex_str = " ".join(f"{b:02X}" for b in frame_bytes)
-                    self.preview_text.insert(tk.END, f"Raw bytes ({len(frame_bytes)}):\n", "header")
-                    self.preview_text.insert(tk.END, hex_str, "hex")
+                    self.preview_text.insert(tk.END,
+                        "Multi Write Request:\n", "header",
+                        "  Transaction ID: ", "field", f"0x{frame.transaction_id:04X}\n", "value",
+                        "  Unit ID: ", "field", f"{frame.unit_id}\n", "value",
+                        "  Function: ", "field", "Write Multiple Registers (0x10)\n", "value",
+                        "  Start Address: ", "field", f"0x{start_addr:04X}", "address",
+                        f" ({start_addr})\n", "value",
+                        "  Count: ", "field", f"{len(values)}\n", "value",
+                        "  Values: [", "field", values_str, "hex", "]\n\n", "field",
+                        f"Raw bytes ({len(frame_bytes)}):\n", "header", format_hex(frame_bytes), "hex")
                     
                 except ValueError as e:
-                    self.preview_text.insert(tk.END, "Invalid values: ", "field")
-                    self.preview_text.insert(tk.END, str(e), "hex")
+                    self.preview_text.insert(tk.END, "Invalid values: ", "field", str(e), "hex")
             
             self.preview_text.config(state=tk.DISABLED)
             
@@ -530,6 +560,14 @@ class ModbusTCPMasterTab:
             self.preview_text.insert(tk.END, "Invalid parameters", "hex")
             self.preview_text.config(state=tk.DISABLED)
     
+    def _parse_values(self, values_str: str) -> List[int]:
+        """Parse comma-separated hex Values text, reusing the last result while it is unchanged"""
+        cached_str, values = self._values_cache
+        if values_str != cached_str:
+            values = [int(v, 16) for v in values_str.split(',')]  # int() ignores the spaces
+            self._values_cache = (values_str, values)
+        return values
+    
     def connect_to_server(self):
         """Connect to Modbus TCP server"""
         if self.is_connected:
@@ -545,6 +583,15 @@ class ModbusTCPMasterTab:
         try:
             # Create socket and connect
             self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # Requests are small and answered one by one; don't let Nagle
+            # hold them back waiting to coalesce
+            self.client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # Probe an idle connection so a dead server is noticed
+            self.client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            if hasattr(socket, 'TCP_KEEPIDLE'):  # Not on every platform; else OS defaults apply
+                self.client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 10)
+                self.client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 3)
+                self.client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3)
             self.client_socket.settimeout(5.0)  # Connection timeout
             self.client_socket.connect((server_ip, server_port))
             
@@ -617,47 +664,19 @@ class ModbusTCPMasterTab:
                     self.transaction_id, self.unit_id, start_addr, count)
                 operation_desc = f"Read {count} registers from 0x{start_addr:04X}"
             else:  # write
-                values_str = self.values_var.get().strip()
-                values = []
-                for v in values_str.split(','):
-                    values.append(int(v.strip(), 16))
+                values = self._parse_values(self.values_var.get().strip())
                 
                 if not values:
                     raise ValueError("No valid values specified")
                 
                 frame = ModbusTCPBuilder.write_multiple_registers_request(
                     self.transaction_id, self.unit_id, start_addr, values)
-                values_preview = ", ".join(f"0x{v:04X}" for v in values[:4])
+                values_preview = format_words(values[:4])
                 if len(values) > 4:
                     values_preview += f"... ({len(values)} total)"
                 operation_desc = f"Write {len(values)} registers from 0x{start_addr:04X}: [{values_preview}]"
             
-            # Send request
-            request_bytes = frame.to_bytes()
-            self.client_socket.send(request_bytes)
-            
-            self.request_count += 1
-            self.update_statistics()
-            
-            # Log request with detailed decoding
-            timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
-            decoded_request = self.decode_request_for_debug(request_bytes, operation_desc)
-            self.add_log(f"[{timestamp}] TX Request (TID: {self.transaction_id:04X}):", "request")
-            self.add_log(f"  {decoded_request}", "debug")
-            
-            # Store pending request for timeout handling
-            self.pending_requests[self.transaction_id] = {
-                'timestamp': datetime.datetime.now(),
-                'operation': operation,
-                'frame': frame
-            }
-            
-            # Schedule timeout check
-            self.frame.after(self.response_timeout, 
-                           lambda tid=self.transaction_id: self.check_timeout(tid))
-            
-            # Increment transaction ID
-            self.transaction_id = (self.transaction_id % 65535) + 1
+            self._transmit(frame, operation, operation_desc)
             self.update_preview()
             
         except ValueError as e:
@@ -666,28 +685,116 @@ class ModbusTCPMasterTab:
             messagebox.showerror("Error", f"Failed to send request: {str(e)}")
             self.disconnect_from_server()
     
+    def send_batch_read(self, ranges: List[Tuple[int, int]],
+                        callback: Callable[[int, List[int]], None]):
+        """Read several register ranges with as few requests as possible.
+        
+        Nearby ranges are merged by merge_read_ranges, and every merged read
+        is sent without waiting for the previous response. As each response
+        arrives, callback(start, values) is called on the Tk thread for each
+        requested range it covers. Ranges whose read gets an exception
+        response, times out, or is lost to a disconnect get no callback;
+        those failures only show in the log.
+        
+        Args:
+            ranges: (start_address, count) pairs
+            callback: Receives a range's start address and its register values
+            
+        Raises:
+            ConnectionError: If not connected to a server
+            ValueError: If a range is empty or longer than 125 registers
+        """
+        if not self.is_connected or not self.client_socket:
+            raise ConnectionError("Not connected to server")
+        
+        reads = merge_read_ranges(ranges)
+        wanted: List[List[Tuple[int, int]]] = [[] for _ in reads]
+        for start, count in ranges:
+            for i, (read_start, read_count) in enumerate(reads):
+                if read_start <= start and start + count <= read_start + read_count:
+                    wanted[i].append((start, count))
+                    break
+        
+        for (read_start, read_count), covered in zip(reads, wanted):
+            def on_values(values, read_start=read_start, covered=covered):
+                for start, count in covered:
+                    offset = start - read_start
+                    callback(start, values[offset:offset + count])
+            
+            frame = ModbusTCPBuilder.read_holding_registers_request(
+                self.transaction_id, self.unit_id, read_start, read_count)
+            self._transmit(frame, "read", f"Read {read_count} registers from 0x{read_start:04X}", on_values)
+        self.update_preview()
+    
+    def _transmit(self, frame: ModbusTCPFrame, operation: str, operation_desc: str,
+                  on_values: Optional[Callable[[List[int]], None]] = None):
+        """Send a request frame, log it, and track it until its response or timeout"""
+        request_bytes = frame.to_bytes()
+        self.client_socket.sendall(request_bytes)  # send() may write only part of it
+        
+        self.request_count += 1
+        self.update_statistics()
+        
+        # Log request with detailed decoding
+        timestamp = format_timestamp()
+        decoded_request = self.decode_request_for_debug(request_bytes, operation_desc)
+        self.add_log(f"[{timestamp}] TX Request (TID: {self.transaction_id:04X}):", "request")
+        self.add_log(f"  {decoded_request}", "debug")
+        
+        # Store pending request for timeout handling
+        self.pending_requests[self.transaction_id] = PendingRequest(
+            time.monotonic(), operation, frame, on_values)
+        
+        # Schedule timeout check
+        self.frame.after(self.response_timeout, 
+                       lambda tid=self.transaction_id: self.check_timeout(tid))
+        
+        # Increment transaction ID
+        self.transaction_id = (self.transaction_id % 65535) + 1
+    
     def receive_worker(self):
         """Persistent receive worker thread"""
         self.frame.after(0, lambda: self.add_log("[DEBUG] Receive worker started", "system"))
         
+        # Set short timeout for receiving to allow checking is_connected
+        if self.client_socket:
+            self.client_socket.settimeout(1.0)
+        # Received bytes land in place in one preallocated buffer; frames
+        # are decoded from buffer[:fill] and any partial tail moved to the front
+        buffer = bytearray(self.RX_BUFFER_SIZE)
+        view = memoryview(buffer)
+        fill = 0
+        
         while self.is_connected and self.client_socket:
             try:
-                # Set short timeout for receiving to allow checking is_connected
-                self.client_socket.settimeout(1.0)
-                
-                # Receive response (minimum 8 bytes for MBAP header + function)
-                data = self.client_socket.recv(1024)
-                if not data:
+                received = self.client_socket.recv_into(view[fill:])
+                if not received:
                     # Connection closed by server
                     if self.is_connected:
                         self.frame.after(0, lambda: self.add_log("Connection closed by server", "error"))
                         self.frame.after(0, self.disconnect_from_server)
                     break
+                fill += received
                 
-                # Parse response
-                response = ModbusTCPFrame.from_bytes(data)
-                if response:
-                    self.handle_response(response)
+                # One recv can hold several back-to-back responses, or part of
+                # one; split out every complete frame by its MBAP length
+                head = 0
+                while fill - head >= 8:
+                    length = _U16.unpack_from(buffer, head + 4)[0]  # Bytes after the length field
+                    if not 2 <= length <= MAX_MBAP_LENGTH:
+                        head = fill  # Out of sync; drop what we have
+                        break
+                    end = head + 6 + length
+                    if end > fill:
+                        break
+                    frame_bytes = bytes(view[head:end])
+                    response = ModbusTCPFrame.from_bytes(frame_bytes)
+                    head = end
+                    if response:
+                        self.handle_response(response, frame_bytes)
+                if head:
+                    buffer[:fill - head] = buffer[head:fill]
+                    fill -= head
                 
             except socket.timeout:
                 # Normal timeout, continue loop
@@ -705,8 +812,21 @@ class ModbusTCPMasterTab:
         
         self.frame.after(0, lambda: self.add_log("[DEBUG] Receive worker stopped", "system"))
     
-    def handle_response(self, response: ModbusTCPFrame):
-        """Handle received response (thread-safe)"""
+    def handle_response(self, response: ModbusTCPFrame, response_bytes: Optional[bytes] = None):
+        """Handle received response (thread-safe).
+        
+        The debug decode is pure bytes-to-text work, so it runs here on the
+        calling (receive) thread; only the bookkeeping and logging go to the
+        Tk thread.
+        
+        Args:
+            response: Parsed response frame
+            response_bytes: Frame as received, if available
+        """
+        if response_bytes is None:
+            response_bytes = response.to_bytes()
+        decoded_response = self.decode_response_for_debug(response_bytes)
+        
         def process_response():
             # Check if this matches a pending request
             if response.transaction_id not in self.pending_requests:
@@ -714,18 +834,14 @@ class ModbusTCPMasterTab:
                 return
             
             request_info = self.pending_requests.pop(response.transaction_id)
-            elapsed = (datetime.datetime.now() - request_info['timestamp']).total_seconds() * 1000
+            elapsed = (time.monotonic() - request_info.timestamp) * 1000
             
-            timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
+            timestamp = format_timestamp()
             self.add_log(f"[{timestamp}] RX Response (TID: {response.transaction_id:04X}, Time: {elapsed:.1f}ms):", "response")
             
             self.response_count += 1
             self.update_statistics()
             
-            # Use improved response decoding
-            response_bytes = response.to_bytes()
-            decoded_response = self.decode_response_for_debug(response_bytes)
-            
             # Check for exception response
             if response.function_code & 0x80:
                 self.error_count += 1
@@ -733,6 +849,10 @@ class ModbusTCPMasterTab:
                 self.add_log(f"  {decoded_response}", "error")
             else:
                 self.add_log(f"  {decoded_response}", "debug")
+                if request_info.on_values is not None:
+                    parsed = ModbusTCPParser.parse_read_holding_registers_response(response)
+                    if parsed:
+                        request_info.on_values(parsed['values'])
         
         # Execute on main thread
         self.frame.after(0, process_response)
@@ -744,19 +864,51 @@ class ModbusTCPMasterTab:
             self.timeout_count += 1
             self.update_statistics()
             
-            timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
+            timestamp = format_timestamp()
             self.add_log(f"[{timestamp}] Timeout for TID: {transaction_id:04X}", "timeout")
             self.add_log(f"  No response received within {self.response_timeout}ms", "timeout")
     
     def add_log(self, message: str, tag: str = "system"):
-        """Add message to log display"""
-        self.log_display.insert(tk.END, message + "\n", tag)
+        """Queue a message for the log display; shown within LOG_FLUSH_MS"""
+        self._log_buffer.append((message + "\n", tag))
+        if not self._log_flush_pending:
+            self._log_flush_pending = True
+            self.frame.after(self.LOG_FLUSH_MS, self._flush_log)
+    
+    def _flush_log(self):
+        """Insert the queued log lines at once, trimming the oldest lines past LOG_MAX_LINES"""
+        self._log_flush_pending = False
+        if not self._log_buffer:
+            return
+        
+        # One insert for everything queued, with adjacent same-tag lines merged
+        segments = []
+        lines = 0
+        for text, tag in self._log_buffer:
+            lines += text.count("\n")
+            if segments and segments[-1] == tag:
+                segments[-2] += text
+            else:
+                segments += (text, tag)
+        self._log_buffer.clear()
+        self.log_display.insert(tk.END, *segments)
+        
+        count = self._log_lines + lines
+        if count > self.LOG_MAX_LINES:
+            # Drop the older half in one delete rather than trimming per insert
+            keep = self.LOG_MAX_LINES // 2
+            self.log_display.delete("1.0", f"{count - keep + 1}.0")
+            count = keep
+        self._log_lines = count
+        
         if self.auto_scroll.get():
             self.log_display.see(tk.END)
     
     def clear_log(self):
         """Clear the log display"""
         self.log_display.delete(1.0, tk.END)
+        self._log_buffer.clear()
+        self._log_lines = 0
     
     def reset_statistics(self):
         """Reset all statistics"""
@@ -24,6 +24,31 @@ class ModbusException(IntEnum):
     SLAVE_DEVICE_FAILURE = 0x04
 
 
+# Precompiled layouts: MBAP header plus function code, and the fixed PDU fields
+_MBAP_FUNCTION = struct.Struct('>HHHBB')  # Transaction, protocol, length, unit ID, function
+_ADDRESS_COUNT = struct.Struct('>HH')      # Start address, register count
+_WRITE_HEADER = struct.Struct('>HHB')      # Start address, register count, byte count
+
+
+def _pack_registers(values: List[int]) -> bytes:
+    """Pack 16-bit register values big-endian in one call"""
+    return struct.pack(f'>{len(values)}H', *values)
+
+
+# Display names, built once rather than on every parse_exception_response /
+# get_function_name call
+_EXCEPTION_NAMES = {
+    int(ModbusException.ILLEGAL_FUNCTION): "Illegal Function",
+    int(ModbusException.ILLEGAL_DATA_ADDRESS): "Illegal Data Address",
+    int(ModbusException.ILLEGAL_DATA_VALUE): "Illegal Data Value",
+    int(ModbusException.SLAVE_DEVICE_FAILURE): "Slave Device Failure"
+}
+_FUNCTION_NAMES = {
+    int(ModbusFunctionCode.READ_HOLDING_REGISTERS): "Read Holding Registers (0x03)",
+    int(ModbusFunctionCode.WRITE_MULTIPLE_REGISTERS): "Write Multiple Registers (0x10)"
+}
+
+
 @dataclass
 class ModbusTCPFrame:
     """Modbus TCP Application Data Unit (ADU)"""
@@ -36,14 +61,12 @@ class ModbusTCPFrame:
     
     def to_bytes(self) -> bytes:
         """Convert frame to bytes for transmission"""
-        # MBAP Header (7 bytes) + PDU data
-        mbap_header = struct.pack('>HHHB', 
-                                 self.transaction_id,
-                                 self.protocol_id,
-                                 self.length,
-                                 self.unit_id)
-        pdu = struct.pack('B', self.function_code) + self.data
-        return mbap_header + pdu
+        # MBAP Header (7 bytes) + function code, then the rest of the PDU
+        return _MBAP_FUNCTION.pack(self.transaction_id,
+                                   self.protocol_id,
+                                   self.length,
+                                   self.unit_id,
+                                   self.function_code) + self.data
     
     @classmethod
     def from_bytes(cls, data: bytes) -> Optional['ModbusTCPFrame']:
@@ -79,6 +102,42 @@ class ModbusTCPFrame:
             return None
 
 
+MAX_READ_REGISTERS = 125  # Most registers one Read Holding Registers request may ask for
+
+
+def merge_read_ranges(ranges: List[Tuple[int, int]], gap: int = 4,
+                      max_count: int = MAX_READ_REGISTERS) -> List[Tuple[int, int]]:
+    """Merge register ranges into as few read requests as possible
+    
+    Ranges that overlap, touch, or are at most `gap` registers apart are
+    read together, as long as the merged read stays within max_count
+    registers. Every input range lies wholly inside one of the results.
+    
+    Args:
+        ranges: (start_address, count) pairs, in any order
+        gap: Unrequested registers worth reading to save a request
+        max_count: Register limit of a single read
+        
+    Returns:
+        (start_address, count) pairs sorted by address
+        
+    Raises:
+        ValueError: If a range is empty or longer than max_count
+    """
+    merged: List[List[int]] = []  # [start, end) of each read
+    for start, count in sorted(ranges):
+        if not 1 <= count <= max_count:
+            raise ValueError(f"Range at 0x{start:04X} must have 1-{max_count} registers, got {count}")
+        end = start + count
+        if merged:
+            last = merged[-1]
+            if start <= last[1] + gap and max(end, last[1]) - last[0] <= max_count:
+                last[1] = max(end, last[1])
+                continue
+        merged.append([start, end])
+    return [(start, end - start) for start, end in merged]
+
+
 class ModbusRegisterMap:
     """16-bit register map for Modbus devices"""
     
@@ -182,7 +241,7 @@ class ModbusTCPBuilder:
     def read_holding_registers_request(transaction_id: int, unit_id: int, 
                                      start_address: int, count: int) -> ModbusTCPFrame:
         """Build read holding registers request"""
-        data = struct.pack('>HH', start_address, count)
+        data = _ADDRESS_COUNT.pack(start_address, count)
         return ModbusTCPFrame(
             transaction_id=transaction_id,
             protocol_id=0x0000,
@@ -197,9 +256,7 @@ class ModbusTCPBuilder:
                                       values: List[int]) -> ModbusTCPFrame:
         """Build read holding registers response"""
         byte_count = len(values) * 2
-        data = struct.pack('B', byte_count)
-        for value in values:
-            data += struct.pack('>H', value)
+        data = bytes((byte_count,)) + _pack_registers(values)
         
         return ModbusTCPFrame(
             transaction_id=transaction_id,
@@ -216,9 +273,7 @@ class ModbusTCPBuilder:
         """Build write multiple registers request"""
         count = len(values)
         byte_count = count * 2
-        data = struct.pack('>HHB', start_address, count, byte_count)
-        for value in values:
-            data += struct.pack('>H', value)
+        data = _WRITE_HEADER.pack(start_address, count, byte_count) + _pack_registers(values)
         
         return ModbusTCPFrame(
             transaction_id=transaction_id,
@@ -233,7 +288,7 @@ class ModbusTCPBuilder:
     def write_multiple_registers_response(transaction_id: int, unit_id: int,
                                         start_address: int, count: int) -> ModbusTCPFrame:
         """Build write multiple registers response"""
-        data = struct.pack('>HH', start_address, count)
+        data = _ADDRESS_COUNT.pack(start_address, count)
         return ModbusTCPFrame(
             transaction_id=transaction_id,
             protocol_id=0x0000,
@@ -361,18 +416,11 @@ class ModbusTCPParser:
         original_function = frame.function_code & 0x7F
         exception_code = frame.data[0]
         
-        exception_names = {
-            ModbusException.ILLEGAL_FUNCTION: "Illegal Function",
-            ModbusException.ILLEGAL_DATA_ADDRESS: "Illegal Data Address",
-            ModbusException.ILLEGAL_DATA_VALUE: "Illegal Data Value",
-            ModbusException.SLAVE_DEVICE_FAILURE: "Slave Device Failure"
-        }
-        
         return {
             'function': 'exception_response',
             'original_function': original_function,
             'exception_code': exception_code,
-            'exception_name': exception_names.get(exception_code, f"Unknown (0x{exception_code:02X})")
+            'exception_name': _EXCEPTION_NAMES.get(exception_code, f"Unknown (0x{exception_code:02X})")
         }
     
     @staticmethod
@@ -381,8 +429,4 @@ class ModbusTCPParser:
         if function_code & 0x80:
             return f"Exception Response (0x{function_code:02X})"
         
-        names = {
-            ModbusFunctionCode.READ_HOLDING_REGISTERS: "Read Holding Registers (0x03)",
-            ModbusFunctionCode.WRITE_MULTIPLE_REGISTERS: "Write Multiple Registers (0x10)"
-        }
-        return names.get(function_code, f"Unknown Function (0x{function_code:02X})")
\ No newline at end of file
+        return _FUNCTION_NAMES.get(function_code, f"Unknown Function (0x{function_code:02X})")
\ No newline at end of file
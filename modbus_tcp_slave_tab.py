@@ -8,21 +8,29 @@ from tkinter import ttk, scrolledtext, messagebox, filedialog
 import socket
 import struct
 import threading
-import datetime
+import collections
 import csv
 from typing import Optional, Dict, List, Any, Tuple
 from modbus_tcp_protocol import (
     ModbusTCPFrame, ModbusTCPBuilder, ModbusTCPParser, ModbusRegisterMap,
     ModbusFunctionCode, ModbusException
 )
+from protocol import decode_words, format_hex, format_timestamp
 from ui_styles import FONTS, SPACING, COLORS, configure_text_widget, create_status_pill, update_status_pill, init_style
 
+# Debug decoders read fields in place from the raw frame
+_MBAP_HEADER = struct.Struct('>HHHB')  # Transaction, protocol, length, unit ID
+_U16 = struct.Struct('>H')
+
 
 class ModbusTCPSlaveTab:
     """Modbus TCP Slave implementation with 4-column responsive layout."""
     
     # Using shared color scheme from ui_styles module
     
+    LOG_MAX_LINES = 5000  # Log is trimmed to half this once exceeded
+    LOG_FLUSH_MS = 100  # add_log batches lines for this long before one insert
+    
     def __init__(self, parent_frame: ttk.Frame):
         """Initialize Modbus TCP Slave Tab."""
         self.frame = parent_frame
@@ -53,6 +61,11 @@ class ModbusTCPSlaveTab:
         
         # UI state
         self.auto_scroll = tk.BooleanVar(value=True)
+        self._log_lines = 0  # Lines currently held by log_display
+        # (text, tag) lines waiting for _flush_log; older lines fall off if
+        # more arrive than the log would keep anyway
+        self._log_buffer = collections.deque(maxlen=self.LOG_MAX_LINES)
+        self._log_flush_pending = False
         self.current_layout = 'wide'
         
         # Build UI
@@ -567,6 +580,8 @@ class ModbusTCPSlaveTab:
                 
                 self.server_socket.settimeout(1.0)
                 client_socket, client_address = self.server_socket.accept()
+                # Send each small response right away instead of under Nagle
+                client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
                 
                 with self.socket_lock:
                     self.client_socket = client_socket
@@ -625,7 +640,7 @@ class ModbusTCPSlaveTab:
                 
                 bytes_received += len(data)
                 # Log hex dump of first few bytes to identify protocol
-                hex_preview = ' '.join(f'{b:02X}' for b in data[:20])
+                hex_preview = format_hex(data[:20])
                 if len(data) > 20:
                     hex_preview += '...'
                 self.frame.after(0, lambda br=bytes_received, hp=hex_preview: self.add_log(
@@ -685,7 +700,7 @@ class ModbusTCPSlaveTab:
         
         try:
             # Parse MBAP header
-            transaction_id, protocol_id, length, unit_id = struct.unpack('>HHHB', response_data[:7])
+            transaction_id, protocol_id, length, unit_id = _MBAP_HEADER.unpack_from(response_data)
             function_code = response_data[7]
             
             # Check if it's an exception response
@@ -699,14 +714,8 @@ class ModbusTCPSlaveTab:
                 num_registers = byte_count // 2
                 
                 # Extract ALL register values with indices
-                values = []
-                reg_index = 0
-                for i in range(9, 9 + byte_count, 2):
-                    if i + 1 < len(response_data):
-                        value = struct.unpack('>H', response_data[i:i+2])[0]
-                        # Format: [index]=value
-                        values.append(f"[{reg_index}]=0x{value:04X}")
-                        reg_index += 1
+                registers = decode_words(response_data, 9, byte_count // 2)
+                values = [f"[{i}]=0x{value:04X}" for i, value in enumerate(registers)]
                 
                 # Format output based on number of registers
                 if num_registers <= 8:
@@ -723,8 +732,8 @@ class ModbusTCPSlaveTab:
                     return f"Read Response ({num_registers} registers):\n{values_str}"
             
             elif function_code == 0x10:  # Write Multiple Registers Response
-                start_addr = struct.unpack('>H', response_data[8:10])[0] if len(response_data) >= 10 else 0
-                quantity = struct.unpack('>H', response_data[10:12])[0] if len(response_data) >= 12 else 0
+                start_addr = _U16.unpack_from(response_data, 8)[0] if len(response_data) >= 10 else 0
+                quantity = _U16.unpack_from(response_data, 10)[0] if len(response_data) >= 12 else 0
                 return f"Write Response - Wrote {quantity} registers from 0x{start_addr:04X} to 0x{start_addr + quantity - 1:04X}"
             
             else:
@@ -744,7 +753,7 @@ class ModbusTCPSlaveTab:
             self.request_count += 1
             self.frame.after(0, self.update_statistics)
             
-            timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
+            timestamp = format_timestamp()
             
             # Check for error simulation
             if self.simulate_errors.get() and self.error_type.get() != "none":
@@ -1008,25 +1017,19 @@ class ModbusTCPSlaveTab:
     
     def refresh_register_view(self):
         """Refresh register map display"""
-        self.register_display.config(state=tk.NORMAL)
-        self.register_display.delete(1.0, tk.END)
-        
         # Header
-        self.register_display.insert(tk.END, "Address  Value   Dec\n", "header")
-        self.register_display.insert(tk.END, "-------  -----  -----\n", "header")
+        segments = ["Address  Value   Dec\n-------  -----  -----\n", "header"]
         
-        # Show non-zero registers
-        for addr in range(1000):
-            value = self.register_map.get_register(addr)
+        # Show non-zero registers as (text, tag) pairs for one multi-segment insert
+        for addr, value in enumerate(self.register_map.get_all()):
             if value != 0:
-                addr_str = f"{addr:04X}"
-                value_str = f"{value:04X}"
-                dec_str = f"{value:5d}"
-                
-                self.register_display.insert(tk.END, f"0x{addr_str}  ", "address")
-                self.register_display.insert(tk.END, f"0x{value_str}  ", "value")
-                self.register_display.insert(tk.END, f"{dec_str}\n")
+                segments += (f"0x{addr:04X}  ", "address",
+                             f"0x{value:04X}  ", "value",
+                             f"{value:5d}\n", "")
         
+        self.register_display.config(state=tk.NORMAL)
+        self.register_display.delete(1.0, tk.END)
+        self.register_display.insert(tk.END, *segments)
         self.register_display.config(state=tk.DISABLED)
     
     def reset_statistics(self):
@@ -1046,11 +1049,43 @@ class ModbusTCPSlaveTab:
         self.errors_label.config(text=str(self.error_count))
     
     def add_log(self, message: str, tag: str = "system"):
-        """Add message to log display"""
-        self.log_display.insert(tk.END, message + "\n", tag)
+        """Queue a message for the log display; shown within LOG_FLUSH_MS"""
+        self._log_buffer.append((message + "\n", tag))
+        if not self._log_flush_pending:
+            self._log_flush_pending = True
+            self.frame.after(self.LOG_FLUSH_MS, self._flush_log)
+    
+    def _flush_log(self):
+        """Insert the queued log lines at once, trimming the oldest lines past LOG_MAX_LINES"""
+        self._log_flush_pending = False
+        if not self._log_buffer:
+            return
+        
+        # One insert for everything queued, with adjacent same-tag lines merged
+        segments = []
+        lines = 0
+        for text, tag in self._log_buffer:
+            lines += text.count("\n")
+            if segments and segments[-1] == tag:
+                segments[-2] += text
+            else:
+                segments += (text, tag)
+        self._log_buffer.clear()
+        self.log_display.insert(tk.END, *segments)
+        
+        count = self._log_lines + lines
+        if count > self.LOG_MAX_LINES:
+            # Drop the older half in one delete rather than trimming per insert
+            keep = self.LOG_MAX_LINES // 2
+            self.log_display.delete("1.0", f"{count - keep + 1}.0")
+            count = keep
+        self._log_lines = count
+        
         if self.auto_scroll.get():
             self.log_display.see(tk.END)
     
     def clear_log(self):
         """Clear the log display"""
-        self.log_display.delete(1.0, tk.END)
\ No newline at end of file
+        self.log_display.delete(1.0, tk.END)
+        self._log_buffer.clear()
+        self._log_lines = 0
\ No newline at end of file
@@ -4,6 +4,11 @@ Protocol implementation for register-based communication
 Implements packet encoding/decoding and Fletcher-16 checksum
 """
 
+import struct
+import sys
+import time
+import zlib
+from array import array
 from typing import Optional, Tuple, List, Dict, Any
 from dataclasses import dataclass
 from enum import IntEnum
@@ -42,6 +47,22 @@ class ErrorCode(IntEnum):
     INTERNAL_ERROR = 0xFF
 
 
+# Function codes bound once as plain ints for the parsers; FunctionCode.X is
+# an attribute lookup on every comparison, and int == int skips the enum type
+_READ_SINGLE = int(FunctionCode.READ_SINGLE)
+_WRITE_SINGLE = int(FunctionCode.WRITE_SINGLE)
+_READ_MULTIPLE = int(FunctionCode.READ_MULTIPLE)
+_WRITE_MULTIPLE = int(FunctionCode.WRITE_MULTIPLE)
+_READ_SINGLE_RESP = int(FunctionCode.READ_SINGLE_RESP)
+_WRITE_SINGLE_RESP = int(FunctionCode.WRITE_SINGLE_RESP)
+_READ_MULTIPLE_RESP = int(FunctionCode.READ_MULTIPLE_RESP)
+_WRITE_MULTIPLE_RESP = int(FunctionCode.WRITE_MULTIPLE_RESP)
+
+
+# Packet header: start flag, device address, message ID, length, function code
+_HEADER = struct.Struct('>5B')
+
+
 @dataclass
 class Packet:
     """Represents a protocol packet for register-based communication.
@@ -68,21 +89,56 @@ class Packet:
         Returns:
             bytes: Complete packet ready for transmission
         """
-        # Build packet without checksum
-        packet = bytearray()
-        packet.append(0x7E)  # Start flag (packet delimiter)
-        packet.append(self.device_address)  # Target device
-        packet.append(self.message_id)      # Message identifier
-        packet.append(len(self.data) + 1)   # Length includes function code
-        packet.append(self.function_code)   # Operation type
-        packet.extend(self.data)            # Payload data
+        packet = bytearray(len(self.data) + 7)
+        self.serialize_into(packet)
+        return bytes(packet)
+    
+    def serialize_into(self, buf: bytearray, offset: int = 0) -> int:
+        """Write the complete packet into a caller-owned buffer.
+        
+        Produces the same bytes as to_bytes() without allocating, so a
+        single transmit buffer can be reused for every packet.
+        
+        Args:
+            buf: Destination buffer, at least len(data) + 7 bytes past offset
+            offset: Position in buf to start writing at
+            
+        Returns:
+            Number of bytes written
+        """
+        data_len = len(self.data)
+        end = offset + 5 + data_len  # End of the checksummed part
+        if end + 2 > len(buf):
+            raise ValueError("Buffer too small for packet")
+        
+        buf[offset] = 0x7E                      # Start flag (packet delimiter)
+        buf[offset + 1] = self.device_address   # Target device
+        buf[offset + 2] = self.message_id       # Message identifier
+        buf[offset + 3] = data_len + 1          # Length includes function code
+        buf[offset + 4] = self.function_code    # Operation type
+        buf[offset + 5:end] = self.data         # Payload data
         
         # Calculate and append checksum
-        checksum = fletcher16(packet)
-        packet.append((checksum >> 8) & 0xFF)  # High byte
-        packet.append(checksum & 0xFF)  # Low byte
+        with memoryview(buf) as view:
+            checksum = fletcher16(view[offset:end])
+        buf[end] = (checksum >> 8) & 0xFF  # High byte
+        buf[end + 1] = checksum & 0xFF     # Low byte
         
-        return bytes(packet)
+        return data_len + 7
+    
+    def reset(self, device_address: int, message_id: int, function_code: int,
+              data: bytes, checksum: Optional[int] = None) -> 'Packet':
+        """Overwrite every field in place so the instance can be reused.
+        
+        Returns:
+            The same packet, for chaining
+        """
+        self.device_address = device_address
+        self.message_id = message_id
+        self.function_code = function_code
+        self.data = data
+        self.checksum = checksum
+        return self
     
     @classmethod
     def from_bytes(cls, data: bytes) -> Optional['Packet']:
@@ -96,36 +152,51 @@ class Packet:
         Returns:
             Packet instance if valid, None if invalid or corrupted
         """
-        if len(data) < 7:  # Minimum packet size
-            return None
+        return cls.from_bytes_into(data, cls.__new__(cls))
+    
+    @staticmethod
+    def from_bytes_into(data: bytes, packet: 'Packet', offset: int = 0) -> Optional['Packet']:
+        """Parse packet from bytes into an existing Packet instance.
         
-        if data[0] != 0x7E:  # Check start flag
-            return None
+        Same validation as from_bytes(), but fills in `packet` via reset()
+        instead of allocating a new one. `packet` is left untouched if the
+        data is invalid. With an offset the packet is read in place from a
+        larger receive buffer, so the caller doesn't have to slice it out.
         
-        device_address = data[1]
-        message_id = data[2]
-        length = data[3]
+        Args:
+            data: Raw bytes (or bytearray) containing the packet
+            packet: Instance to overwrite
+            offset: Index of the start flag within data
+            
+        Returns:
+            `packet` if valid, None if invalid or corrupted
+        """
+        if len(data) - offset < 7:  # Minimum packet size
+            return None
         
-        if len(data) < 6 + length:  # Check if we have full packet
+        start_flag, device_address, message_id, length, function_code = _HEADER.unpack_from(data, offset)
+        if start_flag != 0x7E:  # Check start flag
             return None
         
-        function_code = data[4]
-        payload = data[5:4+length]
+        end = offset + 4 + length  # End of the checksummed part
+        if len(data) < end + 2:  # Check if we have full packet
+            return None
         
         # Verify checksum
-        received_checksum = (data[4+length] << 8) | data[5+length]
-        calculated_checksum = fletcher16(data[:4+length])
+        received_checksum = (data[end] << 8) | data[end + 1]
+        with memoryview(data) as view:
+            calculated_checksum = fletcher16(view[offset:end])
         
         if received_checksum != calculated_checksum:
             return None
         
-        return cls(
-            device_address=device_address,
-            message_id=message_id,
-            function_code=function_code,
-            data=payload,
-            checksum=received_checksum
-        )
+        payload = bytes(data[offset + 5:end])
+        return packet.reset(device_address, message_id, function_code, payload, received_checksum)
+
+
+# Longest run for which adler32's sums stay below its 65521 modulus
+# (n + 255 * n * (n + 1) / 2 < 65521)
+_ADLER_CHUNK = 22
 
 
 def fletcher16(data: bytes) -> int:
@@ -140,14 +211,79 @@ def fletcher16(data: bytes) -> int:
     Returns:
         16-bit checksum value (sum2 in high byte, sum1 in low byte)
     """
+    # zlib.adler32 computes the same two running sums in C, modulo 65521
+    # and with sum1 seeded at 1. Over chunks of up to _ADLER_CHUNK bytes
+    # neither sum can reach 65521, so both are exact and can be reduced
+    # mod 256 and stitched together.
     sum1 = 0  # Sum of all bytes
     sum2 = 0  # Sum of running sum1 values
-    for b in data:
-        sum1 = (sum1 + b) & 0xFF      # Add byte and wrap at 255
-        sum2 = (sum2 + sum1) & 0xFF   # Add to running sum and wrap
+    size = len(data)
+    for start in range(0, size, _ADLER_CHUNK):
+        chunk = data[start:start + _ADLER_CHUNK] if size > _ADLER_CHUNK else data
+        n = len(chunk)
+        adler = zlib.adler32(chunk)
+        sum2 += (adler >> 16) - n + n * sum1  # Earlier bytes count once per byte here
+        sum1 += (adler & 0xFFFF) - 1
+    sum1 &= 0xFF  # Wrap at 255
+    sum2 &= 0xFF
     return (sum2 << 8) | sum1  # Combine into 16-bit value
 
 
+if sys.version_info >= (3, 8):
+    def format_hex(data: bytes) -> str:
+        """Format bytes as space-separated uppercase hex (e.g. "7E 01 0A")"""
+        return data.hex(" ").upper()
+else:
+    # hex() only takes a separator from 3.8 on, so look each byte up in a
+    # table of two-digit strings built once at import
+    _HEX_BYTE = tuple(f"{i:02X}" for i in range(256))
+    
+    def format_hex(data: bytes) -> str:
+        """Format bytes as space-separated uppercase hex (e.g. "7E 01 0A")"""
+        return " ".join([_HEX_BYTE[b] for b in data])
+
+
+# Printable ASCII maps to itself, every other byte to "."
+_ASCII_TABLE = bytes(b if 32 <= b < 127 else 0x2E for b in range(256))
+
+
+def format_ascii(data: bytes) -> str:
+    """Format bytes as printable ASCII, with "." for anything else"""
+    return bytes(data).translate(_ASCII_TABLE).decode('ascii')
+
+
+def format_words(values: List[int]) -> str:
+    """Format 16-bit values as a comma-separated hex list (e.g. "0x0001, 0x00FF")"""
+    if not values:
+        return ""
+    digits = encode_words(values).hex().upper()
+    return "0x" + ", 0x".join([digits[i:i + 4] for i in range(0, len(digits), 4)])
+
+
+# Last whole second seen by format_timestamp and its "HH:MM:SS" text, kept
+# in one tuple so a thread never pairs a new second with a stale prefix
+_ts_cache = (-1, "")
+
+
+def format_timestamp(now: Optional[float] = None) -> str:
+    """Format a time.time() value as local "HH:MM:SS.mmm" for log entries.
+    
+    The "HH:MM:SS" part is only rebuilt when the second changes, so bursts
+    of packets pay for little more than the millisecond suffix.
+    """
+    global _ts_cache
+    if now is None:
+        now = time.time()
+    # Round to whole microseconds first, as datetime does, so float error
+    # can't turn .007 into .006
+    second, micros = divmod(round(now * 1_000_000), 1_000_000)
+    cached_second, prefix = _ts_cache
+    if second != cached_second:
+        prefix = time.strftime("%H:%M:%S", time.localtime(second))
+        _ts_cache = (second, prefix)
+    return f"{prefix}.{micros // 1000:03d}"
+
+
 def encode_word(value: int) -> bytes:
     """Encode 16-bit value as big-endian bytes"""
     return value.to_bytes(2, byteorder='big')
@@ -158,6 +294,26 @@ def decode_word(data: bytes, offset: int = 0) -> int:
     return int.from_bytes(data[offset:offset+2], byteorder='big')
 
 
+def encode_words(values: List[int]) -> bytes:
+    """Encode a sequence of 16-bit values as consecutive big-endian words"""
+    words = array('H', values)  # Raises OverflowError for values outside 0-65535
+    if sys.byteorder == 'little':
+        words.byteswap()
+    return words.tobytes()
+
+
+def decode_words(data: bytes, offset: int, count: int) -> List[int]:
+    """Decode up to `count` big-endian words starting at offset.
+    
+    Stops early, like the per-word loop it replaces, if data runs out.
+    """
+    count = max(0, min(count, (len(data) - offset) // 2))
+    words = array('H', data[offset:offset + 2 * count])
+    if sys.byteorder == 'little':
+        words.byteswap()
+    return words.tolist()
+
+
 class PacketBuilder:
     """Helper class to build protocol packets.
     
@@ -208,17 +364,13 @@ class PacketBuilder:
     @staticmethod
     def read_multiple_response(device_addr: int, msg_id: int, reg_addr: int, values: List[int]) -> Packet:
         """Build read multiple registers response"""
-        data = encode_word(reg_addr) + bytes([len(values)])
-        for value in values:
-            data += encode_word(value)
+        data = encode_word(reg_addr) + bytes([len(values)]) + encode_words(values)
         return Packet(device_addr, msg_id, FunctionCode.READ_MULTIPLE_RESP, data)
     
     @staticmethod
     def write_multiple_request(device_addr: int, msg_id: int, reg_addr: int, values: List[int]) -> Packet:
         """Build write multiple registers request"""
-        data = encode_word(reg_addr) + bytes([len(values)])
-        for value in values:
-            data += encode_word(value)
+        data = encode_word(reg_addr) + bytes([len(values)]) + encode_words(values)
         return Packet(device_addr, msg_id, FunctionCode.WRITE_MULTIPLE, data)
     
     @staticmethod
@@ -246,34 +398,30 @@ class PacketParser:
             'message_id': packet.message_id,
             'function_code': packet.function_code
         }
+        func = packet.function_code
         
-        if packet.function_code == FunctionCode.READ_SINGLE:
+        if func == _READ_SINGLE:
             if len(packet.data) >= 2:
                 result['register_address'] = decode_word(packet.data)
                 return result
                 
-        elif packet.function_code == FunctionCode.WRITE_SINGLE:
+        elif func == _WRITE_SINGLE:
             if len(packet.data) >= 4:
                 result['register_address'] = decode_word(packet.data, 0)
                 result['register_value'] = decode_word(packet.data, 2)
                 return result
                 
-        elif packet.function_code == FunctionCode.READ_MULTIPLE:
+        elif func == _READ_MULTIPLE:
             if len(packet.data) >= 3:
                 result['register_address'] = decode_word(packet.data, 0)
                 result['count'] = packet.data[2]
                 return result
                 
-        elif packet.function_code == FunctionCode.WRITE_MULTIPLE:
+        elif func == _WRITE_MULTIPLE:
             if len(packet.data) >= 3:
                 result['register_address'] = decode_word(packet.data, 0)
                 result['count'] = packet.data[2]
-                values = []
-                for i in range(result['count']):
-                    offset = 3 + (i * 2)
-                    if offset + 1 < len(packet.data):
-                        values.append(decode_word(packet.data, offset))
-                result['values'] = values
+                result['values'] = decode_words(packet.data, 3, result['count'])
                 return result
         
         return None
@@ -295,32 +443,28 @@ class PacketParser:
             return result
         
         result['is_error'] = False
+        func = packet.function_code
         
-        if packet.function_code == FunctionCode.READ_SINGLE_RESP:
+        if func == _READ_SINGLE_RESP:
             if len(packet.data) >= 4:
                 result['register_address'] = decode_word(packet.data, 0)
                 result['register_value'] = decode_word(packet.data, 2)
                 return result
                 
-        elif packet.function_code == FunctionCode.WRITE_SINGLE_RESP:
+        elif func == _WRITE_SINGLE_RESP:
             if len(packet.data) >= 4:
                 result['register_address'] = decode_word(packet.data, 0)
                 result['register_value'] = decode_word(packet.data, 2)
                 return result
                 
-        elif packet.function_code == FunctionCode.READ_MULTIPLE_RESP:
+        elif func == _READ_MULTIPLE_RESP:
             if len(packet.data) >= 3:
                 result['register_address'] = decode_word(packet.data, 0)
                 result['count'] = packet.data[2]
-                values = []
-                for i in range(result['count']):
-                    offset = 3 + (i * 2)
-                    if offset + 1 < len(packet.data):
-                        values.append(decode_word(packet.data, offset))
-                result['values'] = values
+                result['values'] = decode_words(packet.data, 3, result['count'])
                 return result
                 
-        elif packet.function_code == FunctionCode.WRITE_MULTIPLE_RESP:
+        elif func == _WRITE_MULTIPLE_RESP:
             if len(packet.data) >= 3:
                 result['register_address'] = decode_word(packet.data, 0)
                 result['count'] = packet.data[2]
@@ -346,6 +490,8 @@ class RegisterMap:
     Represents a device's register memory space. Each register is
     16-bit (0-65535) and addressed by index. Used in Device tab
     to simulate an embedded device's register-based interface.
+    Values are stored in a typed ``array('H')`` so bulk reads and
+    dumps run over one contiguous buffer.
     """
     
     def __init__(self, size: int = 256):
@@ -355,7 +501,7 @@ class RegisterMap:
             size: Number of 16-bit registers (default 256)
         """
         self.size = size
-        self.registers = [0] * size  # Initialize all registers to 0
+        self.registers = array('H', bytes(2 * size))  # Initialize all registers to 0
     
     def read(self, address: int) -> Optional[int]:
         """Read single register"""
@@ -373,24 +519,37 @@ class RegisterMap:
     def read_multiple(self, address: int, count: int) -> Optional[List[int]]:
         """Read multiple registers"""
         if 0 <= address < self.size and address + count <= self.size:
-            return self.registers[address:address + count]
+            return self.registers[address:address + count].tolist()
         return None
     
     def write_multiple(self, address: int, values: List[int]) -> bool:
         """Write multiple registers"""
         if 0 <= address < self.size and address + len(values) <= self.size:
-            for i, value in enumerate(values):
-                if not (0 <= value <= 0xFFFF):
-                    return False
-            for i, value in enumerate(values):
-                self.registers[address + i] = value
+            try:
+                # Converting first validates every value, so a bad one
+                # leaves the map untouched; the slice store is one memcpy
+                words = array('H', values)
+            except (OverflowError, TypeError):
+                return False
+            self.registers[address:address + len(words)] = words
             return True
         return False
     
     def clear(self):
         """Clear all registers to zero"""
-        self.registers = [0] * self.size
+        self.registers = array('H', bytes(2 * self.size))
     
     def get_all(self) -> List[int]:
         """Get all register values"""
-        return self.registers.copy()
\ No newline at end of file
+        return self.registers.tolist()
+    
+    def as_array(self) -> memoryview:
+        """Get a zero-copy view of all register values.
+        
+        The view is read-only on Python 3.8+; memoryview.toreadonly() does
+        not exist on 3.7, where callers must not write through it.
+        """
+        view = memoryview(self.registers)
+        if sys.version_info >= (3, 8):
+            view = view.toreadonly()
+        return view
\ No newline at end of file
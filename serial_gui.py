@@ -16,6 +16,7 @@ import platform
 import os
 from typing import Optional, List, Tuple
 import json
+from protocol import format_hex, format_ascii, format_timestamp
 from host_tab import HostTab
 from device_tab import DeviceTab
 from modbus_tcp_slave_tab import ModbusTCPSlaveTab
@@ -680,28 +681,34 @@ class SerialGUI:
                     
                     buffer += data
                     
-                    # Process complete lines
-                    while b'\n' in buffer or b'\r' in buffer:
+                    # Process complete lines, advancing a read offset and
+                    # dropping the consumed prefix once per chunk
+                    head = 0
+                    while True:
                         # Find line ending
-                        idx_n = buffer.find(b'\n')
-                        idx_r = buffer.find(b'\r')
+                        idx_n = buffer.find(b'\n', head)
+                        idx_r = buffer.find(b'\r', head)
                         
                         if idx_n == -1:
+                            if idx_r == -1:
+                                break
                             idx = idx_r
                         elif idx_r == -1:
                             idx = idx_n
                         else:
                             idx = min(idx_n, idx_r)
                         
-                        line = buffer[:idx]
-                        buffer = buffer[idx+1:]
+                        line = buffer[head:idx]
+                        head = idx + 1
                         
                         # Skip if it's just another line ending character
-                        if len(buffer) > 0 and buffer[0:1] in (b'\n', b'\r'):
-                            buffer = buffer[1:]
+                        if head < len(buffer) and buffer[head] in (0x0A, 0x0D):
+                            head += 1
                         
                         if line:
                             self.data_queue.put(('rx', line))
+                    if head:
+                        buffer = buffer[head:]
                     
                     # If buffer gets too large without line endings, process it anyway
                     if len(buffer) > 1024:
@@ -759,7 +766,7 @@ class SerialGUI:
             
             # Add timestamp if logging
             if self.logging_enabled.get():
-                timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
+                timestamp = format_timestamp()
                 self.rx_display.insert(tk.END, f"[{timestamp}] RX: ", "system")
             else:
                 self.rx_display.insert(tk.END, "RX: ", "system")
@@ -789,27 +796,15 @@ class SerialGUI:
         self.hex_display.config(state=tk.NORMAL)
         
         # Add timestamp
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
+        timestamp = format_timestamp()
         self.hex_display.insert(tk.END, f"[{timestamp}] {direction}:\n", "system")
         
-        # Format hex output (16 bytes per line)
-        hex_str = ""
-        ascii_str = ""
-        
-        for i, byte in enumerate(data):
-            hex_str += f"{byte:02X} "
-            ascii_str += chr(byte) if 32 <= byte < 127 else "."
-            
-            if (i + 1) % 16 == 0:
-                self.hex_display.insert(tk.END, f"{hex_str:<48} | {ascii_str}\n")
-                hex_str = ""
-                ascii_str = ""
-        
-        # Handle remaining bytes
-        if hex_str:
-            self.hex_display.insert(tk.END, f"{hex_str:<48} | {ascii_str}\n")
-        
-        self.hex_display.insert(tk.END, "\n")
+        # Format hex output (16 bytes per line), inserted in one call
+        ascii_str = format_ascii(data)
+        lines = [f"{format_hex(data[i:i + 16]):<48} | {ascii_str[i:i + 16]}\n"
+                 for i in range(0, len(data), 16)]
+        lines.append("\n")
+        self.hex_display.insert(tk.END, "".join(lines))
         
         if self.auto_scroll_enabled.get():
             self.hex_display.see(tk.END)
@@ -847,7 +842,7 @@ class SerialGUI:
             self.rx_display.config(state=tk.NORMAL)
             
             if self.logging_enabled.get():
-                timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
+                timestamp = format_timestamp()
                 self.rx_display.insert(tk.END, f"[{timestamp}] TX: ", "system")
             else:
                 self.rx_display.insert(tk.END, "TX: ", "system")
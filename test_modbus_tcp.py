@@ -155,5 +155,126 @@ def test_modbus_tcp():
     print("- OK Complete frame encoding/decoding")
 
 
+def test_merge_read_ranges():
+    """Test coalescing of register ranges into read requests"""
+    # Overlapping, touching and nearby ranges share one read
+    assert merge_read_ranges([(10, 2), (0, 4), (4, 2), (3, 5)]) == [(0, 12)]
+    
+    # A gap wider than the tolerance starts a new read
+    assert merge_read_ranges([(0, 2), (7, 1)]) == [(0, 2), (7, 1)]
+    assert merge_read_ranges([(0, 2), (7, 1)], gap=5) == [(0, 8)]
+    
+    # Merged reads stay within the 125-register limit
+    assert merge_read_ranges([(0, 100), (100, 30)]) == [(0, 100), (100, 30)]
+    assert merge_read_ranges([(0, 60), (60, 65)]) == [(0, 125)]
+    
+    # Every input range lies inside one read
+    ranges = [(5, 3), (200, 10), (0, 1), (120, 20), (9, 40)]
+    reads = merge_read_ranges(ranges)
+    for start, count in ranges:
+        assert any(s <= start and start + count <= s + c for s, c in reads)
+    
+    for bad in ([(0, 0)], [(0, 126)]):
+        try:
+            merge_read_ranges(bad)
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+    
+    print("OK - Register range merging working correctly")
+
+
+def test_send_batch_read():
+    """Test pipelined batch reads and their per-range callbacks"""
+    from modbus_tcp_master_tab import ModbusTCPMasterTab
+    
+    class StubSocket:
+        def __init__(self):
+            self.sent = []
+        
+        def sendall(self, data):
+            self.sent.append(data)
+    
+    class StubFrame:
+        def __init__(self):
+            self.timers = []  # (delay_ms, callback) scheduled with a delay
+        
+        def after(self, ms, callback):
+            if ms == 0:
+                callback()  # Hand-offs to the Tk thread run right away
+            else:
+                self.timers.append((ms, callback))
+    
+    # Tab without widgets: just the state send/receive touch
+    master = ModbusTCPMasterTab.__new__(ModbusTCPMasterTab)
+    master.client_socket = StubSocket()
+    master.frame = StubFrame()
+    master.is_connected = True
+    master.transaction_id = 1
+    master.unit_id = 1
+    master.response_timeout = 500
+    master.pending_requests = {}
+    master.request_count = master.response_count = 0
+    master.error_count = master.timeout_count = 0
+    master.update_statistics = lambda: None
+    master.update_preview = lambda: None
+    master.add_log = lambda message, tag="system": None
+    
+    results = []
+    ranges = [(10, 2), (0, 3), (300, 4), (2, 5), (600, 1)]
+    master.send_batch_read(ranges, lambda start, values: results.append((start, values)))
+    
+    # One request per merged read, all sent before any response, each with
+    # its own transaction ID and a timeout
+    requests = [ModbusTCPFrame.from_bytes(data) for data in master.client_socket.sent]
+    reads = [(p['start_address'], p['count']) for p in
+             map(ModbusTCPParser.parse_read_holding_registers_request, requests)]
+    assert reads == [(0, 12), (300, 4), (600, 1)]
+    tids = [frame.transaction_id for frame in requests]
+    assert tids == [1, 2, 3]
+    assert sorted(master.pending_requests) == tids
+    assert len(master.frame.timers) == 3
+    
+    # Register n holds 0x1000 + n, so each slice shows where it came from
+    def respond(frame):
+        p = ModbusTCPParser.parse_read_holding_registers_request(frame)
+        values = [0x1000 + a for a in range(p['start_address'], p['start_address'] + p['count'])]
+        response = ModbusTCPBuilder.read_holding_registers_response(frame.transaction_id, 1, values)
+        master.handle_response(ModbusTCPFrame.from_bytes(response.to_bytes()))
+    
+    # Responses may come back in any order
+    respond(requests[1])
+    respond(requests[0])
+    assert sorted(results) == [
+        (0, [0x1000, 0x1001, 0x1002]),
+        (2, [0x1002, 0x1003, 0x1004, 0x1005, 0x1006]),
+        (10, [0x100A, 0x100B]),
+        (300, [0x112C, 0x112D, 0x112E, 0x112F]),
+    ]
+    
+    # An exception response gives no callback for the ranges it covered
+    results.clear()
+    master.send_batch_read([(50, 2)], lambda start, values: results.append((start, values)))
+    failed = ModbusTCPFrame.from_bytes(master.client_socket.sent[-1])
+    exception = ModbusTCPBuilder.exception_response(
+        failed.transaction_id, 1, ModbusFunctionCode.READ_HOLDING_REGISTERS,
+        ModbusException.ILLEGAL_DATA_ADDRESS)
+    master.handle_response(ModbusTCPFrame.from_bytes(exception.to_bytes()))
+    assert results == []
+    assert master.error_count == 1
+    
+    # Neither does a read that times out; its late response is unexpected
+    for _, check in master.frame.timers:
+        check()
+    assert master.timeout_count == 1  # Only the (600, 1) read was still pending
+    assert master.pending_requests == {}
+    respond(requests[2])
+    assert results == []
+    
+    print("OK - Batch read pipelining and demultiplexing working correctly")
+
+
 if __name__ == "__main__":
-    test_modbus_tcp()
\ No newline at end of file
+    test_modbus_tcp()
+    test_merge_read_ranges()
+    test_send_batch_read()
\ No newline at end of file
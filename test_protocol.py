@@ -4,10 +4,15 @@ Test script for the protocol implementation
 Can be used to verify packet encoding/decoding and checksum calculations
 """
 
+import datetime
+import sys
+import time
+
 from protocol import (
     Packet, PacketBuilder, PacketParser,
     FunctionCode, ErrorCode, RegisterMap,
-    fletcher16, encode_word, decode_word
+    fletcher16, encode_word, decode_word, encode_words, decode_words,
+    format_hex, format_ascii, format_words, format_timestamp
 )
 
 
@@ -21,6 +26,71 @@ def test_fletcher16():
     print(f"  Data: {' '.join(f'{b:02X}' for b in test_data)}")
     print(f"  Checksum: 0x{checksum:04X}")
     print()
+    
+    def reference(data):
+        sum1 = sum2 = 0
+        for b in data:
+            sum1 = (sum1 + b) & 0xFF
+            sum2 = (sum2 + sum1) & 0xFF
+        return (sum2 << 8) | sum1
+    
+    # Cover empty input, chunk boundaries and worst-case byte values
+    for size in (0, 1, 21, 22, 23, 44, 45, 261):
+        for fill in (bytes(i & 0xFF for i in range(size)), b"\xFF" * size):
+            assert fletcher16(fill) == reference(fill), size
+            assert fletcher16(memoryview(bytearray(fill))) == reference(fill), size
+
+
+def test_format_hex():
+    """Test hex display formatting"""
+    assert format_hex(b"") == ""
+    assert format_hex(bytes([0x7E, 0x01, 0xAB, 0x00, 0xFF])) == "7E 01 AB 00 FF"
+    data = bytes(range(256))
+    assert format_hex(data) == " ".join(f"{b:02X}" for b in data)
+    assert format_hex(bytearray(data)) == format_hex(memoryview(data)) == format_hex(data)
+
+
+def test_format_ascii():
+    """Test printable ASCII column formatting"""
+    assert format_ascii(b"") == ""
+    assert format_ascii(b"~AB\x00\x7f 9") == "~AB.. 9"
+    data = bytes(range(256))
+    assert format_ascii(bytearray(data)) == "".join(chr(b) if 32 <= b < 127 else "." for b in data)
+
+
+def test_format_words():
+    """Test register value list formatting"""
+    assert format_words([]) == ""
+    assert format_words([0x0001]) == "0x0001"
+    values = [0x0000, 0x00FF, 0x1234, 0xFFFF]
+    assert format_words(values) == ", ".join(f"0x{v:04X}" for v in values)
+
+
+def test_format_timestamp():
+    """Test log timestamp formatting"""
+    now = int(time.time()) + 0.25
+    expected = datetime.datetime.fromtimestamp(now).strftime("%H:%M:%S.%f")[:-3]
+    assert format_timestamp(now) == expected
+    # Same second reuses the cached prefix, only the milliseconds change
+    second = int(now)
+    assert format_timestamp(second + 0.007)[-4:] == ".007"
+    assert format_timestamp(second + 0.5)[:8] == expected[:8]
+
+
+def test_word_codec():
+    """Test bulk big-endian word encoding/decoding"""
+    values = [0x0000, 0x0102, 0xFFFF]
+    assert encode_words(values) == b"".join(encode_word(v) for v in values)
+    assert encode_words([]) == b""
+    data = b"\x00\x10\x03" + encode_words(values)
+    assert decode_words(data, 3, 3) == values
+    # Truncated data yields only the complete words
+    assert decode_words(data[:-1], 3, 3) == values[:2]
+    
+    request = PacketBuilder.write_multiple_request(device_addr=1, msg_id=1, reg_addr=0x10, values=values)
+    assert PacketParser.parse_request(request)['values'] == values
+    response = PacketBuilder.read_multiple_response(device_addr=1, msg_id=1, reg_addr=0x10, values=values)
+    assert PacketParser.parse_response(response)['values'] == values
 
 
 def test_packet_encoding():
@@ -71,6 +141,51 @@ def test_packet_decoding():
     print()
 
 
+def test_packet_decode_into():
+    """Test decoding into a reused Packet instance"""
+    scratch = Packet(device_address=0, message_id=0, function_code=0, data=b"")
+    
+    first = PacketBuilder.read_single_request(device_addr=5, msg_id=0x20, reg_addr=0x0100)
+    assert Packet.from_bytes_into(first.to_bytes(), scratch) is scratch
+    assert scratch == Packet.from_bytes(first.to_bytes())
+    
+    second = PacketBuilder.write_multiple_request(device_addr=2, msg_id=0x21, reg_addr=0x10, values=[1, 2])
+    assert Packet.from_bytes_into(second.to_bytes(), scratch) is scratch
+    assert (scratch.device_address, scratch.message_id) == (2, 0x21)
+    assert scratch.to_bytes() == second.to_bytes()
+    
+    # Parsing in place from a larger receive buffer
+    stream = bytearray(b"\x00\x00") + first.to_bytes() + b"\x7E"
+    assert Packet.from_bytes_into(stream, scratch, 2) is scratch
+    assert scratch == Packet.from_bytes(first.to_bytes())
+    assert isinstance(scratch.data, bytes)
+    
+    # Invalid data leaves the instance as it was
+    corrupted = bytearray(first.to_bytes())
+    corrupted[-1] ^= 0xFF
+    assert Packet.from_bytes_into(bytes(corrupted), scratch) is None
+    assert scratch.message_id == 0x20
+
+
+def test_packet_serialize_into():
+    """Test serializing into a reused buffer"""
+    buf = bytearray(16)
+    packet = PacketBuilder.write_single_request(device_addr=3, msg_id=0x42, reg_addr=0x0010, reg_value=0xBEEF)
+    n = packet.serialize_into(buf)
+    assert bytes(buf[:n]) == packet.to_bytes()
+    
+    # Offset writes leave the rest of the buffer alone
+    n = packet.serialize_into(buf, offset=4)
+    assert bytes(buf[4:4 + n]) == packet.to_bytes()
+    assert len(buf) == 16
+    
+    try:
+        packet.serialize_into(bytearray(n - 1))
+        assert False, "expected ValueError for a short buffer"
+    except ValueError:
+        pass
+
+
 def test_register_map():
     """Test register map operations"""
     print("Testing register map...")
@@ -96,6 +211,22 @@ def test_register_map():
     # Test bounds checking
     result = reg_map.write(100, 0x9999)
     print(f"  Write to address 100 (out of bounds): {'Failed' if not result else 'Success'}")
+    
+    # Test array view and list snapshots
+    view = reg_map.as_array()
+    assert view[0] == 0x1234 and view[4] == 0xAAAA
+    if sys.version_info >= (3, 8):  # toreadonly() is 3.8+
+        assert view.readonly
+    assert read_values == [0xAAAA, 0xBBBB, 0xCCCC]
+    assert reg_map.get_all()[:2] == [0x1234, 0x5678]
+    
+    # Out-of-range values reject the whole write
+    assert not reg_map.write_multiple(4, [1, 0x10000])
+    assert not reg_map.write_multiple(4, [-1])
+    assert reg_map.read_multiple(4, 3) == [0xAAAA, 0xBBBB, 0xCCCC]
+    assert not reg_map.write_multiple(15, [1, 2])
+    reg_map.clear()
+    assert reg_map.get_all() == [0] * 16
     print()
 
 
@@ -171,8 +302,15 @@ def main():
     print()
     
     test_fletcher16()
+    test_format_hex()
+    test_format_ascii()
+    test_format_words()
+    test_format_timestamp()
+    test_word_codec()
     test_packet_encoding()
     test_packet_decoding()
+    test_packet_decode_into()
+    test_packet_serialize_into()
     test_register_map()
     test_error_responses()
     test_full_communication()